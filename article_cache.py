@@ -0,0 +1,156 @@
+import hashlib
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import diskcache
+import httpx
+
+DEFAULT_CACHE_DIR = os.getenv("ARTICLE_CACHE_DIR", ".article_cache")
+DEFAULT_TTL = int(os.getenv("ARTICLE_CACHE_TTL", str(6 * 60 * 60)))
+DEFAULT_SIZE_LIMIT = int(os.getenv("ARTICLE_CACHE_SIZE_LIMIT", str(256 * 1024 * 1024)))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "cmpid", "ocid", "smid", "_ga", "_hsenc", "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+
+def canonicalize_url(url):
+    """
+    Normalise a URL so the same article maps to one cache key: lowercase
+    scheme/host, drop default ports, fragments and tracking parameters,
+    and sort what is left of the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def parse_article(url, html):
+    from newspaper import Article
+
+    art = Article(url)
+    art.download(input_html=html)
+    art.parse()
+    return art.title + "\n\n" + art.text
+
+
+class ArticleCache:
+    """
+    Disk-backed cache of downloaded article HTML and parsed text, keyed by
+    canonical URL. Entries younger than ttl seconds are served with no
+    request; older ones are revalidated with If-None-Match /
+    If-Modified-Since, and a 304 (or an identical body) skips parsing.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, size_limit=DEFAULT_SIZE_LIMIT):
+        self.cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self.ttl = ttl
+        self.client = httpx.Client(
+            headers={'User-Agent': USER_AGENT},
+            follow_redirects=True,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+        self.counts = {'fresh': 0, 'not_modified': 0, 'unchanged': 0, 'downloaded': 0, 'bytes_downloaded': 0}
+        # fetch runs on several threads at once
+        self.lock = threading.Lock()
+
+    def _count(self, name, n=1):
+        with self.lock:
+            self.counts[name] += n
+
+    def fetch(self, url, parse=parse_article):
+        """Return "title\\n\\ntext" for url, downloading and parsing only when needed."""
+        key = canonicalize_url(url)
+        entry = self.cache.get(key)
+        now = time.time()
+
+        if entry is not None and now - entry['checked_at'] < self.ttl:
+            self._count('fresh')
+            return entry['text']
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.client.get(url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self._count('not_modified')
+            entry['checked_at'] = now
+            self.cache.set(key, entry)
+            return entry['text']
+        response.raise_for_status()
+
+        html = response.text
+        self._count('bytes_downloaded', len(response.content))
+        html_hash = hashlib.sha256(response.content).hexdigest()
+
+        # Servers without validators still often return byte-identical pages
+        if entry is not None and entry['html_hash'] == html_hash:
+            self._count('unchanged')
+            text = entry['text']
+        else:
+            self._count('downloaded')
+            text = parse(str(response.url), html)
+
+        self.cache.set(key, {
+            'url': str(response.url),
+            'html': html,
+            'html_hash': html_hash,
+            'text': text,
+            'etag': response.headers.get("ETag"),
+            'last_modified': response.headers.get("Last-Modified"),
+            'fetched_at': now,
+            'checked_at': now,
+        })
+        return text
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.counts)
+        total = counts['fresh'] + counts['not_modified'] + counts['unchanged'] + counts['downloaded']
+        served = total - counts['downloaded']
+        return {
+            **counts,
+            'hit_rate': served / total if total else 0.0,
+            'entries': len(self.cache),
+            'size_bytes': self.cache.volume(),
+        }
+
+    def clear(self):
+        self.cache.clear()
+        with self.lock:
+            for k in self.counts:
+                self.counts[k] = 0
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_article_cache():
+    """Process-wide default cache, created on first use (fetches run on worker threads)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ArticleCache()
+        return _default_cache
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from embedding_cache import get_embedding_cache
+from llm_clients import get_embeddings
+
+DEFAULT_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+
+
+class OpenAIEmbedder:
+    """Remote OpenAI embeddings, served through the persistent embedding cache."""
+
+    name = "openai"
+    chunk_by = "tokens"  # the model's input limit is in tokens
+
+    def __init__(self, batch_size=500):
+        self.embeddings = get_embeddings(chunk_size=batch_size)
+        self.model = self.embeddings.model
+
+    def embed_documents(self, texts):
+        return get_embedding_cache().embed_documents(self.embeddings, list(texts))
+
+
+class LocalHashingEmbedder:
+    """
+    In-process embeddings with no network: word 1-2 gram counts hashed into
+    n_features buckets and L2-normalised. Stateless, so it needs no fitting
+    and every batch is one sparse transform plus one dense conversion.
+    """
+
+    name = "local"
+    chunk_by = "words"  # no tokenizer, so chunking needs no download either
+
+    def __init__(self, n_features=2 ** 12, batch_size=None):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            stop_words="english",
+            norm="l2",
+        )
+        self.model = f"hashing-{n_features}"
+
+    def embed_documents(self, texts):
+        return self.vectorizer.transform(list(texts)).astype(np.float32).toarray()
+
+
+EMBEDDERS = {
+    OpenAIEmbedder.name: OpenAIEmbedder,
+    LocalHashingEmbedder.name: LocalHashingEmbedder,
+}
+
+
+def get_embedder(backend=None, batch_size=500):
+    """Return the embedder for backend ("openai" or "local"; default from EMBEDDING_BACKEND)."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in EMBEDDERS:
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+    return EMBEDDERS[backend](batch_size=batch_size)
@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+import diskcache
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", ".embedding_cache")
+DEFAULT_SIZE_LIMIT = int(os.getenv("EMBEDDING_CACHE_SIZE_LIMIT", str(512 * 1024 * 1024)))
+
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding cache keyed by sha256(model name + text).
+    Bounded by size_limit bytes with least-recently-used eviction.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, size_limit=DEFAULT_SIZE_LIMIT):
+        self.cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text, model):
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, embeddings, texts):
+        """
+        Return one vector per text, only sending cache misses to
+        embeddings.embed_documents (as a single batched call).
+        """
+        model = getattr(embeddings, "model", type(embeddings).__name__)
+        keys = [self.make_key(t, model) for t in texts]
+        vectors = [self.cache.get(k) for k in keys]
+
+        missing = {}
+        for i, vec in enumerate(vectors):
+            if vec is None:
+                missing.setdefault(keys[i], []).append(i)
+
+        self.hits += len(texts) - sum(len(idx) for idx in missing.values())
+        self.misses += sum(len(idx) for idx in missing.values())
+
+        if missing:
+            miss_keys = list(missing)
+            miss_texts = [texts[missing[k][0]] for k in miss_keys]
+            new_vectors = embeddings.embed_documents(miss_texts)
+            for k, vec in zip(miss_keys, new_vectors):
+                vec = np.asarray(vec, dtype=np.float32)
+                self.cache.set(k, vec)
+                for i in missing[k]:
+                    vectors[i] = vec
+
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def embed_query(self, embeddings, text):
+        model = getattr(embeddings, "model", type(embeddings).__name__)
+        key = self.make_key(text, model)
+        vec = self.cache.get(key)
+        if vec is not None:
+            self.hits += 1
+            return vec
+
+        self.misses += 1
+        vec = np.asarray(embeddings.embed_query(text), dtype=np.float32)
+        self.cache.set(key, vec)
+        return vec
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.cache),
+            'size_bytes': self.cache.volume(),
+        }
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_default_cache = None
+
+
+def get_embedding_cache():
+    """Process-wide default cache, created on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = EmbeddingCache()
+    return _default_cache
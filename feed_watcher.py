@@ -0,0 +1,216 @@
+"""
+Incremental RSS/Atom feed watching for the news summarizer.
+
+Each poll:
+  - requests every feed with its last ETag / Last-Modified (a 304 costs
+    no parsing at all); a feed's new validators are only stored once
+    every new item from it has been summarized or given up on, and a
+    feed with items still being retried is fetched unconditionally,
+  - keeps only entries whose ID is not in the feed's persistent seen-set,
+  - fetches and summarizes just those (news_pipeline.run_pipeline),
+  - appends the summaries to a rolling JSONL digest.
+
+Usage:
+    python feed_watcher.py feeds.txt --interval 900
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import feedparser
+
+from news_pipeline import run_pipeline
+from utils import load_json_state, save_json_state
+
+DEFAULT_STATE_FILE = ".feed_state.json"
+DEFAULT_DIGEST_FILE = "news_digest.jsonl"
+SEEN_LIMIT = 2000  # per feed; far more than any feed keeps listed
+DIGEST_MAX_ENTRIES = 1000
+MAX_ATTEMPTS = 3
+
+
+def entry_id(entry):
+    item_id = entry.get('id') or entry.get('link')
+    if item_id:
+        return item_id
+    return hashlib.sha256(f"{entry.get('title', '')}\0{entry.get('published', '')}".encode("utf-8")).hexdigest()
+
+
+def read_digest(digest_file=DEFAULT_DIGEST_FILE, limit=None):
+    """Most recent digest entries, newest last."""
+    try:
+        with open(digest_file, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+    return entries[-limit:] if limit else entries
+
+
+def _append_digest(digest_file, entries, state):
+    with open(digest_file, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    state['digest_entries'] = state.get('digest_entries', 0) + len(entries)
+
+    # Trim only once the file has doubled, so the rewrite cost is amortised
+    if state['digest_entries'] > 2 * DIGEST_MAX_ENTRIES:
+        kept = read_digest(digest_file, DIGEST_MAX_ENTRIES)
+        tmp_path = f"{digest_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, digest_file)
+        state['digest_entries'] = len(kept)
+
+
+class FeedWatcher:
+    def __init__(self, feeds, fetch, summarize, state_file=DEFAULT_STATE_FILE,
+                 digest_file=DEFAULT_DIGEST_FILE, **pipeline_options):
+        self.feeds = list(dict.fromkeys(feeds))
+        self.fetch = fetch
+        self.summarize = summarize
+        self.state_file = state_file
+        self.digest_file = digest_file
+        self.pipeline_options = pipeline_options
+
+    def new_items(self, state):
+        """
+        Unseen entries across all feeds, and the validators (ETag /
+        Last-Modified) each fetched feed returned. The caller stores a
+        feed's validators only once its items are dealt with.
+        """
+        items = []
+        validators = {}
+        for feed_url in self.feeds:
+            feed_state = state['feeds'].setdefault(feed_url, {'seen': {}, 'failures': {}})
+            # Items awaiting a retry must be listed again, so no conditional GET
+            conditional = not feed_state['failures']
+            parsed = feedparser.parse(
+                feed_url,
+                etag=feed_state.get('etag') if conditional else None,
+                modified=feed_state.get('modified') if conditional else None,
+            )
+            if parsed.get('status') == 304:
+                continue
+            validators[feed_url] = {'etag': parsed.get('etag'), 'modified': parsed.get('modified')}
+
+            listed = {entry_id(entry) for entry in parsed.entries}
+            # Failed items that dropped off the feed can't be retried any more
+            for item_id in [i for i in feed_state['failures'] if i not in listed]:
+                del feed_state['failures'][item_id]
+
+            for entry in parsed.entries:
+                item_id = entry_id(entry)
+                if item_id in feed_state['seen'] or not entry.get('link'):
+                    continue
+                items.append({
+                    'feed': feed_url,
+                    'id': item_id,
+                    'url': entry.link,
+                    'title': entry.get('title', ""),
+                    'published': entry.get('published') or entry.get('updated'),
+                })
+        return items, validators
+
+    def poll(self):
+        """
+        Summarize everything new since the last poll.
+        Yields one digest entry (or failure record) per new item as it completes.
+        """
+        state = load_json_state(self.state_file, {'feeds': {}, 'digest_entries': 0})
+        items, validators = self.new_items(state)
+        if not items:
+            self._store_validators(state, validators, items, set())
+            save_json_state(self.state_file, state)
+            return
+        save_json_state(self.state_file, state)
+
+        done = []
+        processed = set()
+        try:
+            for item, result in zip(items, run_pipeline(
+                [item['url'] for item in items], self.fetch, self.summarize, **self.pipeline_options
+            )):
+                feed_state = state['feeds'][item['feed']]
+                record = {**item, 'success': result['success'], 'checked_at': int(time.time())}
+                if result['success']:
+                    record['summary'] = result['summary']
+                    if result.get('duplicate_of'):
+                        record['duplicate_of'] = result['duplicate_of']
+                    done.append(record)
+                    feed_state['seen'][item['id']] = record['checked_at']
+                    feed_state['failures'].pop(item['id'], None)
+                else:
+                    record['error'] = result['error']
+                    attempts = feed_state['failures'].get(item['id'], 0) + 1
+                    feed_state['failures'][item['id']] = attempts
+                    if attempts >= MAX_ATTEMPTS:
+                        # Give up on it rather than retrying every poll
+                        feed_state['seen'][item['id']] = record['checked_at']
+                        feed_state['failures'].pop(item['id'])
+                processed.add(item['id'])
+                yield record
+        finally:
+            # Keep whatever finished, even if the caller stopped early
+            for feed_state in state['feeds'].values():
+                if len(feed_state['seen']) > SEEN_LIMIT:
+                    newest = sorted(feed_state['seen'].items(), key=lambda kv: kv[1])[-SEEN_LIMIT:]
+                    feed_state['seen'] = dict(newest)
+            if done:
+                _append_digest(self.digest_file, done, state)
+            self._store_validators(state, validators, items, processed)
+            save_json_state(self.state_file, state)
+
+    def _store_validators(self, state, validators, items, processed):
+        # Only for feeds whose every new item was handled and none awaits a retry;
+        # otherwise the next poll would get a 304 and never see those items again
+        for feed_url, values in validators.items():
+            feed_state = state['feeds'][feed_url]
+            pending = any(item['feed'] == feed_url and item['id'] not in processed for item in items)
+            if pending or feed_state['failures']:
+                continue
+            for name, value in values.items():
+                if value:
+                    feed_state[name] = value
+                else:
+                    feed_state.pop(name, None)
+
+
+def read_feed_list(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def main():
+    from near_duplicates import NearDuplicateIndex
+    from news_summarizer_st import fetch_article, summarize_text
+
+    parser = argparse.ArgumentParser(description="Watch RSS/Atom feeds and summarize new items")
+    parser.add_argument("feeds", help="Text file with one feed URL per line")
+    parser.add_argument("--interval", type=float, default=900, help="Seconds between polls")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE)
+    parser.add_argument("--digest", default=DEFAULT_DIGEST_FILE)
+    args = parser.parse_args()
+
+    def report(record):
+        status = "ok" if record['success'] else f"failed: {record['error']}"
+        print(f"[{record['feed']}] {record['title'] or record['url']} - {status}")
+
+    while True:
+        watcher = FeedWatcher(
+            read_feed_list(args.feeds), fetch_article, summarize_text,
+            state_file=args.state_file, digest_file=args.digest,
+            dedupe_index=NearDuplicateIndex(),
+        )
+        for record in watcher.poll():
+            report(record)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+DEFAULT_MAX_DOCS = int(os.getenv("KEYWORD_INDEX_MAX_DOCS", "5000"))
+
+
+class KeywordIndex:
+    """
+    Incremental TF-IDF keyword index over a resume corpus.
+
+    Term counts are kept in a sparse CSR matrix (one row per resume) and
+    document frequencies are updated as resumes are added, so IDF weights
+    always reflect the whole corpus. Tokenisation and stopword removal use
+    scikit-learn's CountVectorizer analyzer; IDF uses the same smoothed
+    formula as TfidfTransformer.
+
+    The corpus holds at most max_docs resumes: once it is full, adding
+    evicts the least recently added or matched ones, and terms no longer
+    used by any remaining resume are dropped from the vocabulary.
+    """
+
+    def __init__(self, stop_words="english", max_docs=DEFAULT_MAX_DOCS):
+        self.analyzer = CountVectorizer(stop_words=stop_words).build_analyzer()
+        self.vocabulary = {}
+        self.terms = []
+        self.keys = []
+        self.key_to_row = {}
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.df = np.zeros(0, dtype=np.int64)
+        self.max_docs = max_docs
+        self.recent = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.key_to_row
+
+    def _vectorize(self, texts, grow=True):
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            row = {}
+            for token in self.analyzer(text):
+                col = self.vocabulary.get(token)
+                if col is None:
+                    if not grow:
+                        continue
+                    col = self.vocabulary[token] = len(self.terms)
+                    self.terms.append(token)
+                row[col] = row.get(col, 0) + 1
+            indices.extend(row)
+            data.extend(row.values())
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(texts), len(self.terms)),
+        )
+
+    def _touch(self, keys):
+        for k in keys:
+            self.recent[k] = None
+            self.recent.move_to_end(k)
+
+    def _evict(self, keep):
+        """Drop least recently used resumes (never those in keep) down to max_docs."""
+        excess = len(self.keys) - self.max_docs
+        if not self.max_docs or excess <= 0:
+            return 0
+        victims = []
+        for k in self.recent:
+            if len(victims) == excess:
+                break
+            if k not in keep:
+                victims.append(k)
+        if not victims:
+            return 0
+
+        dropped = np.array([self.key_to_row[k] for k in victims], dtype=np.int64)
+        alive = np.ones(len(self.keys), dtype=bool)
+        alive[dropped] = False
+        self.df = self.df - np.bincount(self.counts[dropped].indices, minlength=len(self.terms))
+
+        # Forget terms no remaining resume uses, so the vocabulary shrinks too
+        used = self.df > 0
+        self.counts = self.counts[np.flatnonzero(alive)][:, np.flatnonzero(used)].tocsr()
+        self.df = self.df[used]
+        self.terms = [t for t, u in zip(self.terms, used) if u]
+        self.vocabulary = {t: col for col, t in enumerate(self.terms)}
+
+        for k in victims:
+            del self.recent[k]
+        self.keys = [k for k, a in zip(self.keys, alive) if a]
+        self.key_to_row = {k: row for row, k in enumerate(self.keys)}
+        return len(victims)
+
+    def add(self, keys, texts):
+        """Add resumes to the corpus; keys already present are skipped."""
+        with self.lock:
+            keys = list(keys)
+            # A key repeated within one call is added once
+            new = {}
+            for k, t in zip(keys, texts):
+                if k not in self.key_to_row:
+                    new.setdefault(k, t)
+            self._touch(keys)
+            if not new:
+                return 0
+
+            rows = self._vectorize(list(new.values()))
+            n_terms = len(self.terms)
+            counts = self.counts
+            counts.resize((counts.shape[0], n_terms))
+            self.counts = sp.vstack([counts, rows], format="csr")
+
+            df = np.zeros(n_terms, dtype=np.int64)
+            df[:len(self.df)] = self.df
+            df += np.bincount(rows.indices, minlength=n_terms)
+            self.df = df
+
+            for k in new:
+                self.key_to_row[k] = len(self.keys)
+                self.keys.append(k)
+            self._evict(set(keys))
+            return len(new)
+
+    def idf(self):
+        n = len(self.keys)
+        return np.log((1 + n) / (1 + self.df)) + 1
+
+    def match(self, jd_text, keys=None, top_n=None):
+        """
+        Weighted keyword overlap between one JD and many resumes.
+
+        For each resume returns keyword_score (share of the JD's TF-IDF
+        weight the resume covers), matching_keywords and missing_keywords
+        (JD terms absent from the resume), both ordered by weight.
+        """
+        with self.lock:
+            keys = list(self.keys) if keys is None else list(keys)
+            rows = [self.key_to_row[k] for k in keys]
+            self._touch(keys)
+
+            jd_tokens = self.analyzer(jd_text)
+            jd_counts = {}
+            for token in jd_tokens:
+                jd_counts[token] = jd_counts.get(token, 0) + 1
+
+            # JD terms unseen in the corpus get the maximum IDF
+            n = len(self.keys)
+            idf = self.idf()
+            max_idf = np.log(1 + n) + 1
+            jd_terms = list(jd_counts)
+            cols = np.array([self.vocabulary.get(t, -1) for t in jd_terms], dtype=np.int64)
+            known = cols >= 0
+            weights = np.array([jd_counts[t] for t in jd_terms], dtype=np.float64)
+            weights *= np.where(known, idf[np.maximum(cols, 0)] if len(idf) else max_idf, max_idf)
+
+            order = np.argsort(-weights, kind="stable")
+            jd_terms = [jd_terms[i] for i in order]
+            cols, known, weights = cols[order], known[order], weights[order]
+
+            present = np.zeros((len(rows), len(jd_terms)), dtype=bool)
+            if rows and known.any():
+                sub = self.counts[rows][:, cols[known]]
+                present[:, known] = sub.toarray() > 0
+
+            scores = present @ weights / weights.sum() if weights.sum() else np.zeros(len(rows))
+
+        results = []
+        for i, key in enumerate(keys):
+            matching = [t for t, hit in zip(jd_terms, present[i]) if hit]
+            missing = [t for t, hit in zip(jd_terms, present[i]) if not hit]
+            results.append({
+                'key': key,
+                'keyword_score': float(scores[i]),
+                'matching_keywords': matching[:top_n] if top_n else matching,
+                'missing_keywords': missing[:top_n] if top_n else missing,
+            })
+        return results
+
+    def resume_terms(self, key):
+        with self.lock:
+            row = self.counts[self.key_to_row[key]]
+            return {self.terms[c] for c in row.indices}
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_keyword_index():
+    """
+    Process-wide keyword index shared by all callers, bounded to the
+    KEYWORD_INDEX_MAX_DOCS most recently used resumes.
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = KeywordIndex()
+        return _default_index
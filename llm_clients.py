@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+
+import httpx
+from dotenv import load_dotenv
+
+# Keep-alive pool shared by every OpenAI/LangChain client in the process
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_lock = threading.RLock()
+_clients = {}
+_http = {}
+_loop_clients = weakref.WeakKeyDictionary()
+_request_counts = {'sync': 0, 'async': 0}
+_count_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_env():
+    """Load .env once per process instead of on every call."""
+    load_dotenv()
+    return True
+
+
+def _count(request):
+    with _count_lock:
+        _request_counts['sync'] += 1
+
+
+async def _acount(request):
+    with _count_lock:
+        _request_counts['async'] += 1
+
+
+def get_http_client():
+    with _lock:
+        if 'sync' not in _http:
+            _http['sync'] = httpx.Client(
+                limits=POOL_LIMITS, timeout=TIMEOUT, event_hooks={'request': [_count]}
+            )
+        return _http['sync']
+
+
+def _loop_client():
+    """AsyncClient owned by the running event loop, created on first use in that loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _loop_clients.get(loop)
+        if client is None:
+            # Pools of finished loops can't be reused; let them be collected
+            for old in [l for l in _loop_clients if l.is_closed()]:
+                del _loop_clients[old]
+            client = _loop_clients[loop] = httpx.AsyncClient(
+                limits=POOL_LIMITS, timeout=TIMEOUT, event_hooks={'request': [_acount]}
+            )
+        return client
+
+
+class _LoopLocalAsyncClient(httpx.AsyncClient):
+    """
+    AsyncClient that sends every request through a pool belonging to the
+    current event loop. Connections are bound to the loop that opened
+    them, so sharing one pool breaks the second asyncio.run(); this keeps
+    one shareable client object for the cached LangChain/OpenAI clients.
+    """
+
+    async def send(self, request, **kwargs):
+        return await _loop_client().send(request, **kwargs)
+
+
+def get_async_http_client():
+    with _lock:
+        if 'async' not in _http:
+            _http['async'] = _LoopLocalAsyncClient(timeout=TIMEOUT)
+        return _http['async']
+
+
+def _get_or_create(key, factory):
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+        return client
+
+
+def get_chat_model(model=None, temperature=0, **kwargs):
+    """Shared ChatOpenAI instance for this (model, temperature, kwargs) combination."""
+    from langchain_openai import ChatOpenAI
+
+    load_env()
+    if model is not None:
+        kwargs['model'] = model
+    key = ('chat', temperature, tuple(sorted(kwargs.items())))
+    return _get_or_create(key, lambda: ChatOpenAI(
+        temperature=temperature,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        **kwargs,
+    ))
+
+
+def get_embeddings(**kwargs):
+    """Shared OpenAIEmbeddings instance for these kwargs."""
+    from langchain_openai import OpenAIEmbeddings
+
+    load_env()
+    key = ('embeddings', tuple(sorted(kwargs.items())))
+    return _get_or_create(key, lambda: OpenAIEmbeddings(
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        **kwargs,
+    ))
+
+
+def get_openai_client(**kwargs):
+    """Shared openai.OpenAI SDK client."""
+    from openai import OpenAI
+
+    load_env()
+    key = ('openai', tuple(sorted(kwargs.items())))
+    return _get_or_create(key, lambda: OpenAI(http_client=get_http_client(), **kwargs))
+
+
+def _pool_info(client):
+    pool = getattr(getattr(client, '_transport', None), '_pool', None)
+    connections = getattr(pool, 'connections', [])
+    return {
+        'connections': len(connections),
+        'idle': sum(1 for c in connections if c.is_idle()),
+    }
+
+
+def pool_stats():
+    """Client and connection-pool usage for this process."""
+    stats = {
+        'clients': len(_clients),
+        'requests': dict(_request_counts),
+    }
+    if 'sync' in _http:
+        stats['sync_pool'] = _pool_info(_http['sync'])
+    with _lock:
+        loop_clients = [c for loop, c in _loop_clients.items() if not loop.is_closed()]
+    pools = [_pool_info(c) for c in loop_clients]
+    stats['async_pool'] = {
+        'loops': len(pools),
+        'connections': sum(p['connections'] for p in pools),
+        'idle': sum(p['idle'] for p in pools),
+    }
+    return stats
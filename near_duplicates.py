@@ -0,0 +1,113 @@
+"""
+MinHash + LSH near-duplicate detection for article text.
+
+Each text is reduced to word 5-gram shingles (hashed with xxhash), a
+MinHash signature of NUM_PERM values, and BANDS LSH buckets (hashed with
+mmh3). Texts sharing a bucket are candidates; a candidate counts as a
+duplicate when the signatures agree on at least `threshold` of their
+values (an estimate of Jaccard similarity).
+"""
+import re
+import threading
+
+import mmh3
+import numpy as np
+import xxhash
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidate pairs from roughly 0.7 Jaccard up
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(1)
+# a < 2**31 and x < 2**32 keeps a * x + b inside uint64
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text, size=SHINGLE_SIZE):
+    """NUM_PERM-value MinHash signature of text, or None if it has no words."""
+    grams = shingles(text, size)
+    if not grams:
+        return None
+    hashes = np.fromiter((xxhash.xxh32_intdigest(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0)
+
+
+def estimated_jaccard(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+
+def _band_keys(signature, bands=BANDS):
+    rows = len(signature) // bands
+    return [(b, mmh3.hash128(signature[b * rows:(b + 1) * rows].tobytes())) for b in range(bands)]
+
+
+class NearDuplicateIndex:
+    """
+    Incremental LSH index. add() returns the key of an earlier,
+    near-identical text (the cluster representative) or None when the
+    text starts a new cluster. Safe to call from several threads.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.buckets = {}
+        self.signatures = {}
+        self.representative = {}
+        self.lock = threading.Lock()
+
+    def add(self, key, text):
+        signature = minhash_signature(text)
+        if signature is None:
+            return None
+
+        band_keys = _band_keys(signature, self.bands)
+        with self.lock:
+            candidates = {k for band in band_keys for k in self.buckets.get(band, ())}
+            best, best_score = None, self.threshold
+            for candidate in candidates:
+                score = estimated_jaccard(signature, self.signatures[candidate])
+                if score >= best_score:
+                    best, best_score = candidate, score
+
+            if best is not None:
+                rep = self.representative[best]
+                self.representative[key] = rep
+                return rep
+
+            # Only representatives go in the buckets; duplicates map to them
+            self.signatures[key] = signature
+            self.representative[key] = key
+            for band in band_keys:
+                self.buckets.setdefault(band, []).append(key)
+            return None
+
+    def clusters(self):
+        """{representative: [keys...]} in insertion order, representative first."""
+        groups = {}
+        for key, rep in self.representative.items():
+            groups.setdefault(rep, []).append(key)
+        return groups
+
+
+def find_clusters(texts, threshold=DEFAULT_THRESHOLD):
+    """Group a list of texts by near-duplicate cluster; returns lists of indexes."""
+    index = NearDuplicateIndex(threshold)
+    for i, text in enumerate(texts):
+        index.add(i, text)
+    clustered = index.clusters()
+    return [clustered.get(i, [i]) for i in range(len(texts)) if index.representative.get(i, i) == i]
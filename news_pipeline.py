@@ -0,0 +1,197 @@
+"""
+Pipelined fetch -> summarize for lists of article URLs.
+
+Downloads run on one bounded thread pool and LLM calls on another, so
+article N+1 is being fetched while article N is being summarized. Fetches
+to the same domain are limited in concurrency and spaced out by
+min_interval seconds. Results are yielded in input order as soon as each
+one (and every one before it) is ready.
+
+With a NearDuplicateIndex, each fetched article is checked against the
+ones fetched before it; a near-duplicate (e.g. the same wire story on
+another outlet) is not summarized but shares its representative's
+summary, marked with 'duplicate_of'.
+
+Workers never touch Streamlit; the caller renders each yielded result
+(and, with pipeline_events, each streamed summary token) from the
+script thread.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+FETCH_WORKERS = 8
+SUMMARY_WORKERS = 4
+MAX_PER_DOMAIN = 2
+MIN_DOMAIN_INTERVAL = 1.0  # seconds between request starts to one domain
+EVENT_TIMEOUT = 1.0  # how often the consumer checks for lost results while waiting
+
+
+def domain_of(url):
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainLimiter:
+    """Per-domain concurrency cap plus a minimum gap between request starts."""
+
+    def __init__(self, max_per_domain=MAX_PER_DOMAIN, min_interval=MIN_DOMAIN_INTERVAL):
+        self.max_per_domain = max_per_domain
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.slots = {}
+        self.next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        domain = domain_of(url)
+        with self.lock:
+            semaphore = self.slots.setdefault(domain, threading.BoundedSemaphore(self.max_per_domain))
+        semaphore.acquire()
+        try:
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start.get(domain, now))
+                self.next_start[domain] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
+
+
+def run_pipeline(urls, fetch, summarize, **options):
+    """
+    Yield one result dict per URL, in input order:
+        {'url', 'success': True, 'summary', 'full_text', 'metrics'[, 'duplicate_of']}
+        {'url', 'success': False, 'error'}
+    options are those of pipeline_events.
+    """
+    for kind, i, payload in pipeline_events(urls, fetch, summarize, stream_tokens=False, **options):
+        yield payload
+
+
+def pipeline_events(urls, fetch, summarize, fetch_workers=FETCH_WORKERS, summary_workers=SUMMARY_WORKERS,
+                    max_per_domain=MAX_PER_DOMAIN, min_interval=MIN_DOMAIN_INTERVAL, dedupe_index=None,
+                    stream_tokens=True):
+    """
+    Yield ('token', i, text) as summary tokens for article i arrive (articles
+    interleave), and ('result', i, result) for each article in input order.
+    With stream_tokens, summarize is called as summarize(text, on_token=callback).
+
+    Each successful result carries metrics: time to first token (None when
+    not streaming) and total generation time, in seconds.
+    """
+    urls = list(urls)
+    limiter = DomainLimiter(max_per_domain, min_interval)
+    results = [Future() for _ in urls]
+    events = queue.SimpleQueue()
+    tasks = []  # every pool future, to tell "still working" from "result lost"
+    tasks_lock = threading.Lock()
+
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="fetch")
+    summary_pool = ThreadPoolExecutor(max_workers=summary_workers, thread_name_prefix="summarize")
+
+    def fail(i, e):
+        if not results[i].done():
+            results[i].set_result({'url': urls[i], 'success': False, 'error': str(e)})
+
+    def submit(pool, fn, *args):
+        with tasks_lock:
+            tasks.append(pool.submit(fn, *args))
+
+    def summarize_one(i, text):
+        started = time.perf_counter()
+        first_token = []
+
+        def on_token(token):
+            if not first_token:
+                first_token.append(time.perf_counter() - started)
+            events.put(('token', i, token))
+
+        try:
+            summary = summarize(text, on_token=on_token) if stream_tokens else summarize(text)
+        except Exception as e:
+            return fail(i, e)
+        results[i].set_result({
+            'url': urls[i],
+            'success': True,
+            'summary': summary,
+            'full_text': text,
+            'metrics': {
+                'ttft': first_token[0] if first_token else None,
+                'generation_seconds': time.perf_counter() - started,
+            },
+        })
+
+    def fetch_one(i):
+        try:
+            with limiter.slot(urls[i]):
+                text = fetch(urls[i])
+        except Exception as e:
+            return fail(i, e)
+        try:
+            rep = dedupe_index.add(i, text) if dedupe_index is not None else None
+            if rep is None:
+                # Hand straight over to the LLM pool so this fetch thread can take the next URL
+                submit(summary_pool, summarize_one, i, text)
+            else:
+                results[rep].add_done_callback(lambda done: share_summary(i, rep, text, done.result()))
+        except Exception as e:
+            fail(i, e)
+
+    def share_summary(i, rep, text, rep_result):
+        # Runs as a done-callback, where exceptions would be swallowed
+        try:
+            if not rep_result['success']:
+                # Representative failed to summarize; try this copy instead
+                submit(summary_pool, summarize_one, i, text)
+                return
+            results[i].set_result({
+                'url': urls[i],
+                'success': True,
+                'summary': rep_result['summary'],
+                'full_text': text,
+                'duplicate_of': urls[rep],
+            })
+        except Exception as e:
+            fail(i, e)
+
+    def lost_results():
+        # Once no pool task is queued or running, nothing can still fill a result
+        with tasks_lock:
+            if not all(task.done() for task in tasks):
+                return
+        for i, future in enumerate(results):
+            if not future.done():
+                fail(i, RuntimeError("worker stopped without producing a result"))
+
+    # Wake the consumer whenever any result lands
+    for future in results:
+        future.add_done_callback(lambda _: events.put(None))
+
+    try:
+        for i in range(len(urls)):
+            submit(fetch_pool, fetch_one, i)
+
+        next_i = 0
+        while True:
+            while next_i < len(urls) and results[next_i].done():
+                yield 'result', next_i, results[next_i].result()
+                next_i += 1
+            if next_i == len(urls):
+                break
+            try:
+                event = events.get(timeout=EVENT_TIMEOUT)
+            except queue.Empty:
+                lost_results()
+                continue
+            if event is not None:
+                yield event
+    finally:
+        # Stopped early (e.g. generator closed): drop work that hasn't started
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+        summary_pool.shutdown(wait=False, cancel_futures=True)
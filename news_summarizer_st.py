@@ -1,8 +1,15 @@
 import streamlit as st
+import os
 import sys
-from dotenv import load_dotenv
-from newspaper import Article  # ✅ Updated imports
-from langchain_openai import ChatOpenAI
+import numpy as np
+from article_cache import get_article_cache
+from llm_clients import get_chat_model
+from news_pipeline import run_pipeline, pipeline_events, FETCH_WORKERS, SUMMARY_WORKERS, MAX_PER_DOMAIN
+from text_reduction import count_tokens, split_by_tokens
+from near_duplicates import NearDuplicateIndex
+from feed_watcher import FeedWatcher, read_digest, DEFAULT_DIGEST_FILE
+from result_store import fingerprint, run_cached, session_result
+from pathlib import Path
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 import re
@@ -16,59 +23,303 @@ SUMMARY_PROMPT = """You are a concise news summarizer. Given the article text, p
 Article: {article}
 """
 
+# Articles longer than this are summarized map-reduce style: chunks in
+# parallel, then one reduce call that produces the usual format
+MAP_REDUCE_THRESHOLD = int(os.getenv("SUMMARY_MAP_REDUCE_TOKENS", "4000"))
+CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "1500"))
+MAP_CONCURRENCY = 16
+
+CHUNK_PROMPT = """You are summarizing part of a longer news article.
+Write 3-5 short bullet points covering the key facts in this section. Keep names, numbers and dates.
+
+Section {index} of {total}:
+{chunk}
+"""
+
+REDUCE_PROMPT = """You are a concise news summarizer. Given notes on consecutive sections of one article, produce:
+1) Headline (single line)
+2) 2-3 sentence summary
+3) 1-sentence "why it matters"
+
+Article notes:
+{notes}
+"""
+
 def fetch_article(url: str) -> str:
-    art = Article(url)
-    art.download()
-    art.parse()
-    return art.title + "\n\n" + art.text
+    # Cached by canonical URL; stale entries are revalidated with ETag/Last-Modified
+    # before anything is re-downloaded or re-parsed (see article_cache.py)
+    return get_article_cache().fetch(url)
 
-def summarize_text(text: str) -> str:
-    # Load environment variables from .env
-    load_dotenv()
+def stream_chain(chain, inputs, on_token):
+    """Run a prompt | llm chain, passing each content chunk to on_token; returns the full text."""
+    parts = []
+    for chunk in chain.stream(inputs):
+        if chunk.content:
+            on_token(chunk.content)
+            parts.append(chunk.content)
+    return "".join(parts)
+
+def summarize_text(text: str, on_token=None) -> str:
+    """Summarize one article; with on_token, tokens are passed to it as they are generated."""
+    if count_tokens(text) > MAP_REDUCE_THRESHOLD:
+        return summarize_map_reduce(text, on_token=on_token)
     
-    llm = ChatOpenAI(temperature=0.2)
+    # Shared LLM client (pooled keep-alive connections, .env loaded once)
+    llm = get_chat_model(temperature=0.2)
     prompt = PromptTemplate(input_variables=["article"], template=SUMMARY_PROMPT)
+    if on_token is not None:
+        return stream_chain(prompt | llm, {"article": text}, on_token)
+    
     chain = LLMChain(llm=llm, prompt=prompt)
     
     # ✅ use invoke instead of run
     result = chain.invoke({"article": text})
     return result["text"]
 
-def process_articles(urls):
+def summarize_map_reduce(text: str, chunk_tokens: int = CHUNK_TOKENS, on_token=None) -> str:
+    """
+    Summarize a long article by summarizing token-sized chunks concurrently
+    (map), then combining the notes in a single call (reduce). Wall-clock
+    time is about two LLM round trips regardless of article length.
+    Only the reduce step is streamed to on_token.
+    """
+    llm = get_chat_model(temperature=0.2)
+    chunks = split_by_tokens(text, chunk_tokens)
+    
+    map_chain = LLMChain(llm=llm, prompt=PromptTemplate.from_template(CHUNK_PROMPT))
+    notes = map_chain.batch(
+        [{"index": i, "total": len(chunks), "chunk": chunk} for i, chunk in enumerate(chunks, 1)],
+        config={"max_concurrency": MAP_CONCURRENCY},
+    )
+    
+    reduce_prompt = PromptTemplate.from_template(REDUCE_PROMPT)
+    reduce_inputs = {"notes": "\n\n".join(
+        f"Section {i}:\n{note['text'].strip()}" for i, note in enumerate(notes, 1)
+    )}
+    if on_token is not None:
+        return stream_chain(reduce_prompt | llm, reduce_inputs, on_token)
+    
+    reduce_chain = LLMChain(llm=llm, prompt=reduce_prompt)
+    result = reduce_chain.invoke(reduce_inputs)
+    return result["text"]
+
+def process_articles(urls, dedupe=True, **pipeline_options):
     """
     Given a list of article URLs, fetch (via newspaper3k), summarize each article,
     and produce a short digest.
     
+    Fetches and summaries overlap (see news_pipeline.run_pipeline); results
+    come back in input order. With dedupe, near-duplicate articles reuse the
+    summary of the first copy instead of being summarized again.
+    pipeline_options are passed to run_pipeline.
+    
     Usage:
         export OPENAI_API_KEY="sk-..."
         python news_summarizer.py https://example.com/article1 https://example.com/article2
     """
     results = []
     
-    for u in urls:
-        st.write(f"📰 **Fetching:** {u}")
-        try:
-            text = fetch_article(u)
-            st.write("🤖 **Summarizing...**")
-            summary = summarize_text(text)
-            
-            results.append({
-                'url': u,
-                'success': True,
-                'summary': summary,
-                'full_text': text
-            })
-            
-        except Exception as e:
-            st.error(f"❌ **Failed for** {u}: {str(e)}")
-            results.append({
-                'url': u,
-                'success': False,
-                'error': str(e)
-            })
+    dedupe_index = NearDuplicateIndex() if dedupe else None
+    for result in run_pipeline(urls, fetch_article, summarize_text, dedupe_index=dedupe_index, **pipeline_options):
+        if result.get('duplicate_of'):
+            st.write(f"🔁 **Duplicate:** {result['url']} (same story as {result['duplicate_of']})")
+        elif result['success']:
+            st.write(f"📰 **Summarized:** {result['url']}")
+        else:
+            st.error(f"❌ **Failed for** {result['url']}: {result['error']}")
+        results.append(result)
+    
+    return results
+
+def summarize_urls(urls, skip_duplicates=True, fetch_workers=FETCH_WORKERS,
+                   summary_workers=SUMMARY_WORKERS, max_per_domain=MAX_PER_DOMAIN):
+    """Run the pipeline for urls, streaming progress into the page. Returns the result dicts."""
+    # Progress tracking
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    # Process articles: downloads and summaries run concurrently,
+    # results arrive here in input order as soon as they are ready,
+    # and summary tokens stream into each article's slot meanwhile
+    results = []
+    status_text.text(f"Fetching and summarizing {len(urls)} articles...")
+    article_slots = [st.empty() for _ in urls]
+    streamed = {}
+    pipeline = pipeline_events(
+        urls, fetch_article, summarize_text,
+        fetch_workers=int(fetch_workers),
+        summary_workers=int(summary_workers),
+        max_per_domain=int(max_per_domain),
+        dedupe_index=NearDuplicateIndex() if skip_duplicates else None,
+    )
+    
+    for kind, i, payload in pipeline:
+        if kind == "token":
+            streamed[i] = streamed.get(i, "") + payload
+            article_slots[i].info(f"✍️ **Article {i+1}:** {urls[i]}\n\n{streamed[i]}▌")
+            continue
+        
+        result = payload
+        status_text.text(f"Processed article {i+1} of {len(urls)}...")
+        progress_bar.progress((i + 1) / len(urls))
+        
+        if result.get('duplicate_of'):
+            article_slots[i].info(f"🔁 Article {i+1} is a near-duplicate of {result['duplicate_of']}, reusing its summary")
+        elif result['success']:
+            timing = result['metrics']
+            first_token = f"first token {timing['ttft']:.1f}s, " if timing['ttft'] is not None else ""
+            article_slots[i].success(
+                f"✅ Completed article {i+1}: {result['url']} ({first_token}total {timing['generation_seconds']:.1f}s)"
+            )
+        else:
+            article_slots[i].error(f"❌ **Failed for** {result['url']}: {result['error']}")
+        results.append(result)
+    
+    # Complete progress
+    progress_bar.progress(1.0)
+    status_text.text("✅ All articles processed!")
     
     return results
 
+def render_results(results, show_full_text=False):
+    # Display results
+    st.subheader("📋 Summary Results")
+    
+    successful_results = [r for r in results if r['success'] and not r.get('duplicate_of')]
+    duplicate_results = [r for r in results if r.get('duplicate_of')]
+    failed_results = [r for r in results if not r['success']]
+    
+    # Duplicates are shown under the article whose summary they share
+    duplicates_of = {}
+    for r in duplicate_results:
+        duplicates_of.setdefault(r['duplicate_of'], []).append(r['url'])
+    
+    # Summary stats
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Articles", len(results))
+    with col2:
+        st.metric("Successful", len(successful_results) + len(duplicate_results))
+    with col3:
+        st.metric("Failed", len(failed_results))
+    with col4:
+        st.metric(
+            "LLM Calls Avoided", len(duplicate_results),
+            help="Summaries skipped because the article was a near-duplicate of another one"
+        )
+    
+    # Latency: time to first streamed token and total generation time per summary
+    ttfts = [r['metrics']['ttft'] for r in successful_results if r['metrics']['ttft'] is not None]
+    # Batch API results (openai_batch.py merge) carry no timings
+    generation = [r['metrics']['generation_seconds'] for r in successful_results
+                  if r['metrics']['generation_seconds'] is not None]
+    if generation:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("First Token p50", f"{np.percentile(ttfts, 50):.2f}s" if ttfts else "n/a")
+        with col2:
+            st.metric("First Token p95", f"{np.percentile(ttfts, 95):.2f}s" if ttfts else "n/a")
+        with col3:
+            st.metric("Generation p50", f"{np.percentile(generation, 50):.2f}s")
+        with col4:
+            st.metric("Generation p95", f"{np.percentile(generation, 95):.2f}s")
+    
+    # Display successful summaries
+    for i, result in enumerate(successful_results, 1):
+        st.write("---")
+        st.subheader(f"📰 Article {i}")
+        st.write(f"**URL:** {result['url']}")
+        if duplicates_of.get(result['url']):
+            st.write("**🔁 Same story also at:**")
+            for dup_url in duplicates_of[result['url']]:
+                st.write(f"- {dup_url}")
+        
+        # Display summary
+        st.write("**Summary:**")
+        st.info(result['summary'])
+        
+        # Show full text if requested
+        if show_full_text:
+            with st.expander("📄 Full Article Text"):
+                st.text_area(
+                    f"Full text for article {i}:",
+                    result['full_text'],
+                    height=200,
+                    disabled=True,
+                    key=f"full_text_{i}"
+                )
+    
+    # Display failed articles
+    if failed_results:
+        st.subheader("❌ Failed Articles")
+        for result in failed_results:
+            st.error(f"**{result['url']}**: {result['error']}")
+    
+    # Export option
+    if successful_results:
+        st.subheader("💾 Export Results")
+        
+        # Create text digest
+        digest_text = "NEWS DIGEST\n" + "="*50 + "\n\n"
+        for i, result in enumerate(successful_results, 1):
+            digest_text += f"ARTICLE {i}\n"
+            digest_text += f"URL: {result['url']}\n"
+            for dup_url in duplicates_of.get(result['url'], []):
+                digest_text += f"ALSO AT: {dup_url}\n"
+            digest_text += "\n"
+            digest_text += f"SUMMARY:\n{result['summary']}\n\n"
+            digest_text += "-" * 50 + "\n\n"
+        
+        st.download_button(
+            label="📥 Download News Digest",
+            data=digest_text,
+            file_name="news_digest.txt",
+            mime="text/plain"
+        )
+
+FEED_MODE = "Watch RSS/Atom feeds"
+FEEDS_FILE = "feeds.txt"
+
+def feed_mode():
+    """Poll the configured feeds, summarize only items not seen before, show the rolling digest."""
+    feeds_path = Path(FEEDS_FILE)
+    feed_input = st.text_area(
+        "Feed URLs (one per line):",
+        value=feeds_path.read_text(encoding="utf-8") if feeds_path.exists() else "",
+        height=150,
+        placeholder="https://example.com/rss.xml\nhttps://example.com/atom.xml"
+    )
+    feeds = [f.strip() for f in feed_input.split('\n') if f.strip()]
+    
+    if st.button("🔄 Check feeds for new items", type="primary"):
+        if not feeds:
+            st.error("❌ Please provide at least one feed URL.")
+            return
+        feeds_path.write_text("\n".join(feeds) + "\n", encoding="utf-8")
+        
+        watcher = FeedWatcher(feeds, fetch_article, summarize_text, dedupe_index=NearDuplicateIndex())
+        new_count = 0
+        with st.spinner("Checking feeds..."):
+            for record in watcher.poll():
+                new_count += 1
+                if record['success']:
+                    st.success(f"✅ {record['title'] or record['url']}")
+                else:
+                    st.error(f"❌ **Failed for** {record['url']}: {record['error']}")
+        if new_count == 0:
+            st.info("No new items since the last check.")
+    
+    digest = read_digest(DEFAULT_DIGEST_FILE, limit=50)
+    if digest:
+        st.subheader("🗞️ Rolling Digest")
+        for entry in reversed(digest):
+            with st.expander(f"{entry['title'] or entry['url']}"):
+                st.write(f"**URL:** {entry['url']}")
+                st.write(f"**Feed:** {entry['feed']}")
+                if entry.get('published'):
+                    st.write(f"**Published:** {entry['published']}")
+                st.info(entry['summary'])
+
 # Streamlit App
 def main():
     st.title("📰 News Article Summarizer")
@@ -78,7 +329,7 @@ def main():
     st.subheader("🔗 Article URLs")
     input_method = st.radio(
         "Choose input method:",
-        ["Enter URLs manually", "Upload text file with URLs"]
+        ["Enter URLs manually", "Upload text file with URLs", FEED_MODE]
     )
     
     urls = []
@@ -100,6 +351,9 @@ def main():
                     for i, url in enumerate(urls, 1):
                         st.write(f"{i}. {url}")
     
+    elif input_method == FEED_MODE:
+        feed_mode()
+    
     else:
         # File upload
         uploaded_file = st.file_uploader("Choose a text file with URLs", type=['txt'])
@@ -122,119 +376,50 @@ def main():
             show_full_text = st.checkbox("Show full article text", value=False)
         with col2:
             auto_scroll = st.checkbox("Auto-scroll to results", value=True)
+        
+        skip_duplicates = st.checkbox(
+            "Summarize near-duplicate articles only once", value=True,
+            help="Syndicated copies of the same story share one summary (MinHash/LSH on the article text)"
+        )
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            fetch_workers = st.number_input("Parallel downloads", min_value=1, max_value=32, value=FETCH_WORKERS)
+        with col2:
+            summary_workers = st.number_input("Parallel summaries", min_value=1, max_value=16, value=SUMMARY_WORKERS)
+        with col3:
+            max_per_domain = st.number_input(
+                "Max downloads per site", min_value=1, max_value=8, value=MAX_PER_DOMAIN,
+                help="Politeness limit for concurrent requests to the same domain"
+            )
+    
+    # Results are kept per input fingerprint, so widget-only reruns (e.g. toggling
+    # "Show full article text") re-render them without fetching or summarizing again
+    results_key = fingerprint(urls, skip_duplicates) if urls else None
     
     # Submit button
-    if st.button("🚀 Summarize Articles", type="primary"):
+    if input_method != FEED_MODE and st.button("🚀 Summarize Articles", type="primary"):
         if not urls:
             st.error("❌ Please provide at least one article URL.")
             return
         
         try:
-            # Progress tracking
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Process articles
-            results = []
-            
-            for i, url in enumerate(urls):
-                status_text.text(f"Processing article {i+1} of {len(urls)}...")
-                progress_bar.progress((i) / len(urls))
-                
-                st.write(f"📰 **Fetching:** {url}")
-                try:
-                    with st.spinner("Downloading article..."):
-                        text = fetch_article(url)
-                    
-                    with st.spinner("Generating summary..."):
-                        summary = summarize_text(text)
-                    
-                    results.append({
-                        'url': url,
-                        'success': True,
-                        'summary': summary,
-                        'full_text': text
-                    })
-                    
-                    st.success(f"✅ Completed article {i+1}")
-                    
-                except Exception as e:
-                    st.error(f"❌ **Failed for** {url}: {str(e)}")
-                    results.append({
-                        'url': url,
-                        'success': False,
-                        'error': str(e)
-                    })
-            
-            # Complete progress
-            progress_bar.progress(1.0)
-            status_text.text("✅ All articles processed!")
-            
-            # Display results
-            st.subheader("📋 Summary Results")
-            
-            successful_results = [r for r in results if r['success']]
-            failed_results = [r for r in results if not r['success']]
-            
-            # Summary stats
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Total Articles", len(urls))
-            with col2:
-                st.metric("Successful", len(successful_results))
-            with col3:
-                st.metric("Failed", len(failed_results))
-            
-            # Display successful summaries
-            for i, result in enumerate(successful_results, 1):
-                st.write("---")
-                st.subheader(f"📰 Article {i}")
-                st.write(f"**URL:** {result['url']}")
-                
-                # Display summary
-                st.write("**Summary:**")
-                st.info(result['summary'])
-                
-                # Show full text if requested
-                if show_full_text:
-                    with st.expander("📄 Full Article Text"):
-                        st.text_area(
-                            f"Full text for article {i}:",
-                            result['full_text'],
-                            height=200,
-                            disabled=True,
-                            key=f"full_text_{i}"
-                        )
-            
-            # Display failed articles
-            if failed_results:
-                st.subheader("❌ Failed Articles")
-                for result in failed_results:
-                    st.error(f"**{result['url']}**: {result['error']}")
-            
-            # Export option
-            if successful_results:
-                st.subheader("💾 Export Results")
-                
-                # Create text digest
-                digest_text = "NEWS DIGEST\n" + "="*50 + "\n\n"
-                for i, result in enumerate(successful_results, 1):
-                    digest_text += f"ARTICLE {i}\n"
-                    digest_text += f"URL: {result['url']}\n\n"
-                    digest_text += f"SUMMARY:\n{result['summary']}\n\n"
-                    digest_text += "-" * 50 + "\n\n"
-                
-                st.download_button(
-                    label="📥 Download News Digest",
-                    data=digest_text,
-                    file_name="news_digest.txt",
-                    mime="text/plain"
-                )
-                
+            _, reused = run_cached(
+                "news", results_key,
+                lambda: summarize_urls(urls, skip_duplicates, int(fetch_workers), int(summary_workers), int(max_per_domain)),
+                # Failed fetches/summaries are worth retrying on the next click
+                shareable=lambda results: all(r['success'] for r in results),
+            )
+            if reused:
+                st.info("♻️ Showing results computed earlier for the same URLs.")
         except Exception as e:
             st.error(f"❌ An error occurred: {str(e)}")
             st.error("Please check your OpenAI API key and internet connection.")
     
+    results = session_result("news", results_key) if results_key else None
+    if results is not None:
+        render_results(results, show_full_text)
+    
     # Sidebar with information
     with st.sidebar:
         st.header("ℹ️ How it works")
@@ -260,6 +445,17 @@ def main():
         st.write("Make sure to set your OpenAI API key in a .env file:")
         st.code('OPENAI_API_KEY="sk-..."')
         
+        st.header("🗄️ Article Cache")
+        cache_stats = get_article_cache().stats()
+        st.write(
+            f"Served from cache: {cache_stats['hit_rate']:.0%} | "
+            f"Not modified: {cache_stats['not_modified']} | "
+            f"Downloaded: {cache_stats['downloaded']} | "
+            f"Cached articles: {cache_stats['entries']}"
+        )
+        if st.button("Clear article cache"):
+            get_article_cache().clear()
+        
         st.header("📰 Supported Sources")
         st.write("""
         - Most news websites
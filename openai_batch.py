@@ -0,0 +1,245 @@
+"""
+Overnight bulk jobs through the OpenAI Batch API:
+
+    prepare -> submit -> wait -> merge
+
+Requests use the same prompts, models and input preparation as the
+interactive apps (RESUME_PROMPT over prepare_resume_text in
+resume_extractor_st, SUMMARY_PROMPT in news_summarizer_st), and merged
+results use the same record shapes as batch_resume_to_json /
+process_articles. The Batch API reports no per-request timing, so the
+latency fields of merged records are None.
+
+Usage:
+    python openai_batch.py prepare resumes resumes/ --requests batch_requests.jsonl
+    python openai_batch.py submit --requests batch_requests.jsonl
+    python openai_batch.py wait <batch_id>
+    python openai_batch.py merge <batch_id> --requests batch_requests.jsonl --output results.jsonl
+
+Set OPENAI_BASE_URL (or --base-url) to point at openai_stub_server.py for local runs.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from llm_clients import get_openai_client
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+DEFAULT_REQUESTS_FILE = "batch_requests.jsonl"
+# Request fields only needed locally by merge_results; submit_batch strips them
+LOCAL_FIELDS = {'kind', 'url', 'full_text'}
+
+
+def _chat_request(custom_id, kind, model, temperature, prompt):
+    # 'kind' picks the merge schema (see LOCAL_FIELDS)
+    return {
+        'custom_id': custom_id,
+        'kind': kind,
+        'method': "POST",
+        'url': CHAT_ENDPOINT,
+        'body': {
+            'model': model,
+            'temperature': temperature,
+            'messages': [{'role': "user", 'content': prompt}],
+        },
+    }
+
+
+def build_resume_requests(items):
+    """items: iterable of (custom_id, resume_text), the text already run through prepare_resume_text."""
+    from resume_extractor_st import RESUME_MODEL, RESUME_PROMPT
+
+    for custom_id, resume_text in items:
+        prompt = RESUME_PROMPT.format_messages(text=resume_text)[0].content
+        yield _chat_request(custom_id, "resume", RESUME_MODEL, 0, prompt)
+
+
+def build_summary_requests(items):
+    """
+    items: iterable of (url, article_text). custom_id is "<position>:<url>"
+    because the Batch API needs it unique and a URL may be listed twice.
+    """
+    from langchain_openai import ChatOpenAI
+    from news_summarizer_st import SUMMARY_PROMPT
+
+    # Same default model the interactive summarizer gets from ChatOpenAI()
+    model = ChatOpenAI.model_fields['model_name'].default
+    for i, (url, article_text) in enumerate(items):
+        request = _chat_request(f"{i}:{url}", "summary", model, 0.2, SUMMARY_PROMPT.format(article=article_text))
+        # Kept for the merged record's url and full_text, like process_articles
+        request['url'] = url
+        request['full_text'] = article_text
+        yield request
+
+
+def write_requests(path, requests):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request) + "\n")
+            count += 1
+    return count
+
+
+def read_requests(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def submit_batch(client, requests_path, description=None):
+    """Upload the requests file and create a batch job. Returns the batch object."""
+    lines = [
+        json.dumps({k: v for k, v in request.items() if k not in LOCAL_FIELDS})
+        for request in read_requests(requests_path)
+    ]
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+    batch_file = client.files.create(file=(Path(requests_path).name, payload), purpose="batch")
+    return client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=CHAT_ENDPOINT,
+        completion_window="24h",
+        metadata={'description': description} if description else None,
+    )
+
+
+def wait_for_batch(client, batch_id, poll_interval=60, timeout=None):
+    """Poll until the batch reaches a terminal state. Returns the batch object."""
+    started = time.monotonic()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in TERMINAL_STATES:
+            return batch
+        if timeout is not None and time.monotonic() - started > timeout:
+            raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+        time.sleep(poll_interval)
+
+
+def _read_file_lines(client, file_id):
+    if not file_id:
+        return []
+    content = client.files.content(file_id).text
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def merge_results(client, batch, requests_path):
+    """
+    Join batch output back to the input IDs, in input order.
+    Resume requests become {"file", "ok", "data"|"error", "seconds"} (as
+    in batch_resume_to_json); summary requests become {"url", "success",
+    "summary", "full_text", "metrics"} or {"url", "success", "error"} (as
+    in process_articles).
+    """
+    from resume_extractor_st import parse_resume_json
+
+    responses = {}
+    for row in _read_file_lines(client, batch.output_file_id) + _read_file_lines(client, batch.error_file_id):
+        response = row.get('response') or {}
+        if row.get('error') or response.get('status_code') != 200:
+            error = row.get('error') or response.get('body', {}).get('error') or {}
+            responses[row['custom_id']] = (False, error.get('message', "request failed"))
+        else:
+            responses[row['custom_id']] = (True, response['body']['choices'][0]['message']['content'].strip())
+
+    merged = []
+    for request in read_requests(requests_path):
+        custom_id = request['custom_id']
+        ok, value = responses.get(custom_id, (False, f"no result (batch {batch.status})"))
+
+        if request['kind'] == "resume":
+            record = {'file': custom_id, 'ok': ok}
+            if ok:
+                try:
+                    record['data'] = parse_resume_json(value)
+                except json.JSONDecodeError as e:
+                    record.update(ok=False, error=f"JSONDecodeError: {e}")
+            else:
+                record['error'] = value
+            record['seconds'] = None
+        else:
+            record = {'url': request.get('url', custom_id), 'success': ok}
+            if ok:
+                record.update(
+                    summary=value,
+                    full_text=request.get('full_text', ""),
+                    metrics={'ttft': None, 'generation_seconds': None},
+                )
+            else:
+                record['error'] = value
+
+        merged.append(record)
+    return merged
+
+
+def _prepare_items(kind, source):
+    if kind == "resumes":
+        from resume_extractor_st import prepare_resume_text
+
+        for pdf_path in sorted(Path(source).glob("*.pdf")):
+            # Same header/footer cleanup and token budget as resume_to_json
+            yield str(pdf_path), prepare_resume_text(input_path=str(pdf_path))[0]
+    else:
+        from news_summarizer_st import fetch_article
+
+        urls = [u.strip() for u in Path(source).read_text(encoding="utf-8").splitlines() if u.strip()]
+        for url in urls:
+            try:
+                yield url, fetch_article(url)
+            except Exception as e:
+                print(f"Skipping {url}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Batch API pipeline for resumes and news articles")
+    parser.add_argument("--base-url", default=None, help="API base URL (e.g. a local stub server)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prepare = subparsers.add_parser("prepare", help="Write the requests JSONL")
+    prepare.add_argument("kind", choices=["resumes", "articles"])
+    prepare.add_argument("source", help="Folder of PDF resumes, or a text file of article URLs")
+    prepare.add_argument("--requests", default=DEFAULT_REQUESTS_FILE)
+
+    submit = subparsers.add_parser("submit", help="Upload the requests JSONL and create a batch")
+    submit.add_argument("--requests", default=DEFAULT_REQUESTS_FILE)
+    submit.add_argument("--description", default=None)
+
+    wait = subparsers.add_parser("wait", help="Poll a batch until it finishes")
+    wait.add_argument("batch_id")
+    wait.add_argument("--poll-interval", type=float, default=60)
+
+    merge = subparsers.add_parser("merge", help="Download results and merge them with the inputs")
+    merge.add_argument("batch_id")
+    merge.add_argument("--requests", default=DEFAULT_REQUESTS_FILE)
+    merge.add_argument("--output", default="batch_results.jsonl")
+
+    args = parser.parse_args()
+
+    if args.command == "prepare":
+        items = _prepare_items(args.kind, args.source)
+        builder = build_resume_requests if args.kind == "resumes" else build_summary_requests
+        count = write_requests(args.requests, builder(items))
+        print(f"Wrote {count} requests to {args.requests}")
+        return
+
+    client = get_openai_client(base_url=args.base_url) if args.base_url else get_openai_client()
+
+    if args.command == "submit":
+        batch = submit_batch(client, args.requests, args.description)
+        print(f"Submitted batch {batch.id} ({batch.status})")
+
+    elif args.command == "wait":
+        batch = wait_for_batch(client, args.batch_id, poll_interval=args.poll_interval)
+        print(f"Batch {batch.id}: {batch.status} {batch.request_counts}")
+
+    elif args.command == "merge":
+        batch = client.batches.retrieve(args.batch_id)
+        merged = merge_results(client, batch, args.requests)
+        with open(args.output, "w", encoding="utf-8") as f:
+            for record in merged:
+                f.write(json.dumps(record) + "\n")
+        print(f"Merged {len(merged)} results into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
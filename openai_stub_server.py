@@ -0,0 +1,316 @@
+"""
+Local stand-in for the OpenAI files, uploads and batches endpoints, for
+exercising openai_batch.py and upload_registry.py (and anything else that
+uploads files) without network access or API cost.
+
+    with StubOpenAIServer() as server:
+        client = OpenAI(api_key="stub", base_url=server.base_url)
+
+Or run it standalone:
+    python openai_stub_server.py --port 8765
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_responder(body):
+    """Fake chat completion text for one batched request body."""
+    return "stub response"
+
+
+class StubOpenAIServer:
+    def __init__(self, host="127.0.0.1", port=0, responder=default_responder):
+        self.responder = responder
+        self.files = {}
+        self.uploads = {}
+        self.batches = {}
+        # File content received through /files and /uploads parts, for checking reuse
+        self.bytes_received = 0
+        self.lock = threading.RLock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- storage helpers -------------------------------------------------
+
+    def add_file(self, filename, purpose, content, expires_after=None):
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        created_at = int(time.time())
+        with self.lock:
+            self.files[file_id] = {
+                'meta': {
+                    'id': file_id,
+                    'object': "file",
+                    'bytes': len(content),
+                    'created_at': created_at,
+                    'expires_at': created_at + int(expires_after['seconds']) if expires_after else None,
+                    'filename': filename,
+                    'purpose': purpose,
+                    'status': "processed",
+                },
+                'content': content,
+            }
+        return self.files[file_id]['meta']
+
+    def get_file(self, file_id):
+        """Stored file, or None if unknown or past its expires_at."""
+        with self.lock:
+            f = self.files.get(file_id)
+            if f and f['meta']['expires_at'] and f['meta']['expires_at'] <= time.time():
+                del self.files[file_id]
+                f = None
+            return f
+
+    def _run_batch(self, batch):
+        content = self.files[batch['input_file_id']]['content'].decode("utf-8")
+        # Like the real API, a file with a repeated custom_id fails validation
+        custom_ids = [json.loads(line)['custom_id'] for line in content.splitlines() if line.strip()]
+        if len(set(custom_ids)) < len(custom_ids):
+            batch['status'] = "failed"
+            batch['errors'] = {'object': "list", 'data': [
+                {'code': "duplicate_custom_id", 'message': "The custom_id for each request must be unique."}
+            ]}
+            batch['failed_at'] = int(time.time())
+            return
+
+        output, errors = [], []
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            try:
+                text = self.responder(request['body'])
+                output.append({
+                    'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                    'custom_id': request['custom_id'],
+                    'response': {
+                        'status_code': 200,
+                        'request_id': uuid.uuid4().hex,
+                        'body': {
+                            'id': f"chatcmpl-{uuid.uuid4().hex[:16]}",
+                            'object': "chat.completion",
+                            'model': request['body'].get('model', "stub"),
+                            'choices': [{
+                                'index': 0,
+                                'message': {'role': "assistant", 'content': text},
+                                'finish_reason': "stop",
+                            }],
+                        },
+                    },
+                    'error': None,
+                })
+            except Exception as e:
+                errors.append({
+                    'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                    'custom_id': request['custom_id'],
+                    'response': None,
+                    'error': {'code': "stub_error", 'message': str(e)},
+                })
+
+        def to_jsonl(rows):
+            return "".join(json.dumps(r) + "\n" for r in rows).encode("utf-8")
+
+        batch['output_file_id'] = self.add_file("batch_output.jsonl", "batch_output", to_jsonl(output))['id'] if output else None
+        batch['error_file_id'] = self.add_file("batch_errors.jsonl", "batch_output", to_jsonl(errors))['id'] if errors else None
+        batch['request_counts'] = {'total': len(output) + len(errors), 'completed': len(output), 'failed': len(errors)}
+        batch['status'] = "completed"
+        batch['completed_at'] = int(time.time())
+
+    # --- HTTP handler ----------------------------------------------------
+
+    def _make_handler(server):
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, payload, raw=False):
+                body = payload if raw else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _not_found(self):
+                self._send(404, {'error': {'message': f"No route for {self.command} {self.path}"}})
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return self.rfile.read(length)
+
+            def _form(self, file_field):
+                """Fields and (filename, content) of a multipart/form-data body."""
+                message = BytesParser(policy=HTTP).parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("latin-1") + self._body()
+                )
+                fields, filename, content = {}, "upload", b""
+                for part in message.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    if name == file_field:
+                        filename = part.get_filename() or filename
+                        content = part.get_payload(decode=True)
+                    else:
+                        fields[name] = part.get_content().strip()
+                with server.lock:
+                    server.bytes_received += len(content)
+                return fields, filename, content
+
+            def do_POST(self):
+                if self.path == "/v1/files":
+                    fields, filename, content = self._form("file")
+                    expires_after = None
+                    if "expires_after[seconds]" in fields:
+                        expires_after = {'anchor': fields.get("expires_after[anchor]"), 'seconds': fields["expires_after[seconds]"]}
+                    return self._send(200, server.add_file(filename, fields.get("purpose", ""), content, expires_after))
+
+                if self.path == "/v1/uploads":
+                    request = json.loads(self._body())
+                    upload = {
+                        'id': f"upload_{uuid.uuid4().hex[:24]}",
+                        'object': "upload",
+                        'bytes': request['bytes'],
+                        'filename': request['filename'],
+                        'purpose': request['purpose'],
+                        'status': "pending",
+                        'created_at': int(time.time()),
+                        'expires_at': int(time.time()) + 3600,
+                        'file': None,
+                        '_expires_after': request.get('expires_after'),
+                        '_parts': {},
+                    }
+                    with server.lock:
+                        server.uploads[upload['id']] = upload
+                    return self._send(200, _public(upload))
+
+                match = re.fullmatch(r"/v1/uploads/([\w-]+)/(parts|complete|cancel)", self.path)
+                if match and match.group(1) in server.uploads:
+                    upload = server.uploads[match.group(1)]
+                    if upload['status'] != "pending":
+                        return self._send(400, {'error': {'message': f"Upload is already {upload['status']}"}})
+
+                    if match.group(2) == "parts":
+                        _, _, content = self._form("data")
+                        part = {'id': f"part_{uuid.uuid4().hex[:24]}", 'object': "upload.part",
+                                'created_at': int(time.time()), 'upload_id': upload['id']}
+                        with server.lock:
+                            upload['_parts'][part['id']] = content
+                        return self._send(200, part)
+
+                    if match.group(2) == "cancel":
+                        with server.lock:
+                            upload['status'] = "cancelled"
+                            upload['_parts'].clear()
+                        return self._send(200, _public(upload))
+
+                    request = json.loads(self._body())
+                    with server.lock:
+                        # Parts are joined in the order given, not the order they arrived
+                        content = b"".join(upload['_parts'][part_id] for part_id in request['part_ids'])
+                        if len(content) != upload['bytes']:
+                            return self._send(400, {'error': {'message': f"Expected {upload['bytes']} bytes, got {len(content)}"}})
+                        upload['file'] = server.add_file(upload['filename'], upload['purpose'], content, upload['_expires_after'])
+                        upload['status'] = "completed"
+                        upload['_parts'].clear()
+                    return self._send(200, _public(upload))
+
+                if self.path == "/v1/batches":
+                    request = json.loads(self._body())
+                    if request['input_file_id'] not in server.files:
+                        return self._send(404, {'error': {'message': "input file not found"}})
+                    batch = {
+                        'id': f"batch_{uuid.uuid4().hex[:24]}",
+                        'object': "batch",
+                        'endpoint': request['endpoint'],
+                        'input_file_id': request['input_file_id'],
+                        'completion_window': request.get('completion_window', "24h"),
+                        'status': "in_progress",
+                        'created_at': int(time.time()),
+                        'output_file_id': None,
+                        'error_file_id': None,
+                        'metadata': request.get('metadata'),
+                        'request_counts': {'total': 0, 'completed': 0, 'failed': 0},
+                    }
+                    with server.lock:
+                        server.batches[batch['id']] = batch
+                    return self._send(200, batch)
+
+                self._not_found()
+
+            def do_GET(self):
+                if self.path.split("?")[0] == "/v1/files":
+                    live = [server.get_file(file_id) for file_id in list(server.files)]
+                    return self._send(200, {
+                        'object': "list",
+                        'data': [f['meta'] for f in live if f],
+                        'has_more': False,
+                    })
+
+                match = re.fullmatch(r"/v1/files/([\w-]+)(/content)?", self.path)
+                f = server.get_file(match.group(1)) if match else None
+                if f:
+                    return self._send(200, f['content'], raw=True) if match.group(2) else self._send(200, f['meta'])
+
+                match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+                if match and match.group(1) in server.batches:
+                    batch = server.batches[match.group(1)]
+                    # Report in_progress once, then complete, so callers exercise polling
+                    with server.lock:
+                        if batch['status'] == "in_progress" and batch.pop('_polled', False):
+                            server._run_batch(batch)
+                        elif batch['status'] == "in_progress":
+                            batch['_polled'] = True
+                    return self._send(200, _public(batch))
+
+                self._not_found()
+
+            def do_DELETE(self):
+                match = re.fullmatch(r"/v1/files/([\w-]+)", self.path)
+                if match and match.group(1) in server.files:
+                    with server.lock:
+                        del server.files[match.group(1)]
+                    return self._send(200, {'id': match.group(1), 'object': "file", 'deleted': True})
+                self._not_found()
+
+        return Handler
+
+
+def _public(record):
+    return {k: v for k, v in record.items() if not k.startswith("_")}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI files/uploads/batches API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = StubOpenAIServer(args.host, args.port)
+    print(f"Serving stub OpenAI API at {server.base_url}")
+    server.httpd.serve_forever()
@@ -0,0 +1,108 @@
+"""
+Rerun-safe result store for the Streamlit apps.
+
+Streamlit re-executes the whole script on every widget change, so results
+computed under `if st.button(...)` vanish as soon as a checkbox is
+toggled. Apps instead save results under a fingerprint of their inputs
+and render whatever the store holds for the current inputs:
+
+    key = fingerprint(uploaded.getvalue(), jd_text, pooling)
+    if st.button("Analyze"):
+        result, reused = run_cached("resume_jd_match", key, lambda: analyze(...))
+    result = session_result("resume_jd_match", key)
+    if result is not None:
+        render(result)
+
+session_result only looks at this session (latest result per app), so
+widget-only reruns re-render from memory. run_cached also checks a
+process-wide LRU (shared across sessions, entries expire after
+RESULT_STORE_TTL seconds) before doing the work.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "64"))
+TTL = int(os.getenv("RESULT_STORE_TTL", "3600"))
+
+
+def fingerprint(*parts):
+    """Stable hash of the inputs that determine a result (bytes are hashed, not serialised)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            h.update(b"bytes:" + hashlib.sha256(part).digest())
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ProcessResultCache:
+    """Thread-safe LRU of results with a time-to-live."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.time(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_process_cache():
+    return ProcessResultCache()
+
+
+def session_result(namespace, key):
+    """Result saved in this session for these inputs, or None."""
+    slot = st.session_state.get(f"result_store:{namespace}", {})
+    return slot['value'] if slot.get('key') == key else None
+
+
+def save_result(namespace, key, value, shared=True):
+    # Only the latest result per app is kept in the session
+    st.session_state[f"result_store:{namespace}"] = {'key': key, 'value': value}
+    if shared:
+        get_process_cache().put((namespace, key), value)
+
+
+def run_cached(namespace, key, compute, shareable=None):
+    """
+    Return (value, reused). Reuses a result computed earlier in this
+    process for the same inputs; otherwise calls compute(). A compute()
+    result of None (failure) is not stored; shareable(value) can keep
+    partial failures out of the process cache (they stay in the session).
+    """
+    value = get_process_cache().get((namespace, key))
+    if value is not None:
+        save_result(namespace, key, value, shared=False)
+        return value, True
+
+    value = compute()
+    if value is not None:
+        save_result(namespace, key, value, shared=shareable is None or shareable(value))
+    return value, False
@@ -1,48 +1,49 @@
 import streamlit as st
 import os
-import PyPDF2
 import argparse
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI  # ✅ updated import
+import asyncio
+import hashlib
+import inspect
+import re
+from functools import lru_cache
+import diskcache
+import sys
+import time
+from pathlib import Path
+from llm_clients import get_chat_model, load_env
+from pdf_text import iter_pages
+import text_reduction
+from text_reduction import reduce_pages, reduce_text
+from result_store import fingerprint, run_cached, session_result
 from langchain.prompts import ChatPromptTemplate
 import json
 import traceback
 import tempfile
 
-# Your original functions - unchanged
+def extract_pdf_pages(pdf_path, backend=None):
+    # Backend defaults to PDF_BACKEND (see pdf_text.py); empty pages fall back to the others
+    return list(iter_pages(pdf_path, backend=backend))
+
 def extract_pdf_text(pdf_path):
-    text = ""
-    with open(pdf_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
-
-def resume_to_json(input_path=None, resume_text=None):
-    # Load environment variables
-    load_dotenv()
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    
-    if not OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY not found in .env file")
-    
-    if input_path:
-        resume_text = extract_pdf_text(input_path)
-    elif not resume_text:
-        raise ValueError("Either input_path or resume_text must be provided.")
-    
-    # Prompt template
-    prompt_template = """
+    return "".join(page + "\n" for page in extract_pdf_pages(pdf_path) if page)
+
+# Prompt template
+RESUME_FIELDS = {
+    "Name": '""',
+    "Email": '""',
+    "Phone": '""',
+    "Education": '""',
+    "Experience": "[]",
+    "Skills": "[]",
+}
+CONTACT_FIELDS = ["Name", "Email", "Phone"]
+
+def build_prompt_template(fields):
+    skeleton = ",\n".join(f'      "{field}": {RESUME_FIELDS[field]}' for field in fields)
+    return """
     Extract the following information from this resume text and return it strictly as valid JSON:
     {{
-      "Name": "",
-      "Email": "",
-      "Phone": "",
-      "Education": "",
-      "Experience": [],
-      "Skills": []
+""" + skeleton + """
     }}
     
     Resume Text:
@@ -52,15 +53,288 @@ def resume_to_json(input_path=None, resume_text=None):
     - Return ONLY valid JSON.
     - Do not include ```json or any extra text.
     """
-    chat_prompt = ChatPromptTemplate.from_template(prompt_template)
+
+RESUME_PROMPT_TEMPLATE = build_prompt_template(RESUME_FIELDS)
+RESUME_PROMPT = ChatPromptTemplate.from_template(RESUME_PROMPT_TEMPLATE)
+RESUME_MODEL = "gpt-4o-mini"
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "6000"))
+
+@lru_cache(maxsize=None)
+def get_resume_prompt(fields):
+    """Prompt asking only for the given fields (a tuple)."""
+    if list(fields) == list(RESUME_FIELDS):
+        return RESUME_PROMPT
+    return ChatPromptTemplate.from_template(build_prompt_template(fields))
+
+# Result cache: keyed on the raw input bytes, prompt and pipeline versions,
+# token budget and model, so re-uploads of the same PDF skip both PDF
+# parsing and the LLM call
+PROMPT_VERSION = hashlib.sha256(RESUME_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+RESULT_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", ".resume_cache")
+RESULT_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", str(7 * 24 * 3600)))
+RESULT_CACHE_SIZE_LIMIT = int(os.getenv("RESUME_CACHE_SIZE_LIMIT", str(256 * 1024 * 1024)))
+
+@st.cache_resource
+def get_result_cache():
+    # One Cache object per process, shared by every Streamlit session
+    return diskcache.Cache(
+        RESULT_CACHE_DIR,
+        size_limit=RESULT_CACHE_SIZE_LIMIT,
+        eviction_policy="least-recently-used",
+    )
+
+def resume_cache_key(input_path=None, resume_text=None, fields=None):
+    if input_path:
+        raw = Path(input_path).read_bytes()
+    else:
+        raw = (resume_text or "").encode("utf-8")
+    key = (f"{hashlib.sha256(raw).hexdigest()}:{PROMPT_VERSION}:{PIPELINE_VERSION}:"
+           f"{RESUME_TOKEN_BUDGET}:{RESUME_MODEL}")
+    if fields and list(fields) != list(RESUME_FIELDS):
+        key += ":" + ",".join(fields)
+    return key
+
+def cache_result(key, result_str):
+    # Only cache responses that actually parse
+    try:
+        parse_resume_json(result_str)
+    except json.JSONDecodeError:
+        return
+    get_result_cache().set(key, result_str, expire=RESULT_CACHE_TTL)
+
+# Deterministic fast path for contact fields
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+# Separators never include newlines, so a match can't span lines
+PHONE_RE = re.compile(r"(?<![\w@.])\+?\(?\d[\d \t().-]{8,}\d(?![\w@]|\.\d)")
+YEAR_RE = re.compile(r"(19|20)\d\d")
+PHONE_SEPARATOR_RE = re.compile(r"\d[ \t().-]+\d")
+DOTTED_QUAD_RE = re.compile(r"\d{1,3}(?:\.\d{1,3}){3}")
+DECIMAL_RE = re.compile(r"(?<![\d.])\d+\.\d{1,2}(?![\d.])")
+
+def extract_contact_fields(text):
+    """
+    Pull Email/Phone out of resume text with regexes, returning only
+    the fields matched with high confidence. Name is always left to the
+    LLM: headings like "Senior Software Engineer" look just like names.
+    """
+    fields = {}
     
-    # Initialize LLM
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=OPENAI_API_KEY)
+    email = EMAIL_RE.search(text)
+    if email:
+        fields["Email"] = email.group().rstrip(".")
     
-    # Run pipeline
-    pipeline = chat_prompt | llm
-    output_message = pipeline.invoke({"text": resume_text})
-    return output_message.content.strip()  # ensure clean string
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group().strip()
+        digits = re.sub(r"\D", "", candidate)
+        groups = re.findall(r"\d+", candidate)
+        # Skip things like "2019 - 2021 2022" (date ranges)
+        if not 10 <= len(digits) <= 15 or all(YEAR_RE.fullmatch(g) for g in groups):
+            continue
+        # IP addresses and decimals like "GPA 3.8" are not phone numbers
+        if DOTTED_QUAD_RE.fullmatch(candidate) or DECIMAL_RE.search(candidate):
+            continue
+        # A bare digit run is only a phone number at exactly 10 digits;
+        # longer ones are usually order/account IDs
+        formatted = candidate.startswith("+") or PHONE_SEPARATOR_RE.search(candidate)
+        if not formatted and len(digits) != 10:
+            continue
+        fields["Phone"] = candidate
+        break
+    
+    return fields
+
+# Cached results also depend on the fast path and the text reduction, so a
+# change to either (or to its patterns) must not serve stale results
+PIPELINE_VERSION = hashlib.sha256("\n".join([
+    inspect.getsource(extract_contact_fields),
+    EMAIL_RE.pattern, PHONE_RE.pattern, YEAR_RE.pattern,
+    PHONE_SEPARATOR_RE.pattern, DOTTED_QUAD_RE.pattern, DECIMAL_RE.pattern,
+    inspect.getsource(text_reduction),
+]).encode("utf-8")).hexdigest()[:12]
+
+@st.cache_resource
+def get_fast_path_stats():
+    # Process-wide counters, shared by every Streamlit session
+    return {
+        'documents': 0,
+        'fields_requested': 0,
+        'fields_filled': 0,
+        'llm_calls': 0,
+        'llm_skipped': 0,
+        'llm_seconds': 0.0,
+    }
+
+def record_fast_path(fields, fast, llm_seconds=None):
+    stats = get_fast_path_stats()
+    stats['documents'] += 1
+    stats['fields_requested'] += len(fields)
+    stats['fields_filled'] += len(fast)
+    if llm_seconds is None:
+        stats['llm_skipped'] += 1
+    else:
+        stats['llm_calls'] += 1
+        stats['llm_seconds'] += llm_seconds
+
+def fast_path_summary():
+    """Fast-path hit rate and estimated latency saved (skipped calls x mean LLM latency)."""
+    stats = get_fast_path_stats()
+    mean_llm = stats['llm_seconds'] / stats['llm_calls'] if stats['llm_calls'] else 0.0
+    return {
+        **stats,
+        'hit_rate': stats['fields_filled'] / stats['fields_requested'] if stats['fields_requested'] else 0.0,
+        'estimated_seconds_saved': stats['llm_skipped'] * mean_llm,
+    }
+
+def split_fields(resume_text, fields):
+    """Return (fields filled by the fast path, fields still needing the LLM)."""
+    fast = {k: v for k, v in extract_contact_fields(resume_text).items() if k in fields}
+    return fast, [f for f in fields if f not in fast]
+
+def merge_fields(fields, fast, llm_data):
+    merged = {f: fast[f] if f in fast else llm_data.get(f) for f in fields if f in fast or f in llm_data}
+    # Keep anything extra the model returned
+    merged.update({k: v for k, v in llm_data.items() if k not in merged})
+    return merged
+
+def check_api_key():
+    # Load environment variables
+    load_env()
+    if not os.getenv("OPENAI_API_KEY"):
+        raise ValueError("OPENAI_API_KEY not found in .env file")
+
+def prepare_resume_text(input_path=None, resume_text=None):
+    """
+    Extract and shrink the resume text before it goes into the prompt:
+    drop repeated headers/footers and page numbers, collapse whitespace
+    and enforce RESUME_TOKEN_BUDGET. Returns (text, token stats).
+    """
+    if input_path:
+        return reduce_pages(extract_pdf_pages(input_path), max_tokens=RESUME_TOKEN_BUDGET)
+    elif resume_text:
+        return reduce_text(resume_text, max_tokens=RESUME_TOKEN_BUDGET)
+    raise ValueError("Either input_path or resume_text must be provided.")
+
+def resume_to_json(input_path=None, resume_text=None, use_cache=True, fields=None):
+    """
+    Extract resume fields to a JSON string. Email/Phone found by the
+    regex fast path are not asked of the LLM; if that covers every
+    requested field the LLM is skipped.
+    """
+    fields = list(fields or RESUME_FIELDS)
+    key = resume_cache_key(input_path, resume_text, fields) if use_cache else None
+    if key:
+        cached = get_result_cache().get(key)
+        if cached is not None:
+            return cached
+    
+    resume_text, _ = prepare_resume_text(input_path, resume_text)
+    fast, remaining = split_fields(resume_text, fields)
+    
+    llm_data, llm_seconds = {}, None
+    if remaining:
+        check_api_key()
+        # Shared LLM client (pooled keep-alive connections)
+        llm = get_chat_model(RESUME_MODEL, temperature=0)
+        
+        # Run pipeline
+        started = time.perf_counter()
+        pipeline = get_resume_prompt(tuple(remaining)) | llm
+        output_message = pipeline.invoke({"text": resume_text})
+        llm_seconds = time.perf_counter() - started
+        llm_data = parse_resume_json(output_message.content.strip())
+    
+    record_fast_path(fields, fast, llm_seconds)
+    result_str = json.dumps(merge_fields(fields, fast, llm_data))
+    if key:
+        cache_result(key, result_str)
+    return result_str
+
+def stream_resume_fields(resume_text, fields):
+    """Stream the LLM output for the given fields of prepared resume text, as text chunks."""
+    check_api_key()
+    
+    llm = get_chat_model(RESUME_MODEL, temperature=0)
+    pipeline = get_resume_prompt(tuple(fields)) | llm
+    for chunk in pipeline.stream({"text": resume_text}):
+        yield chunk.content
+
+async def aresume_to_json(input_path=None, resume_text=None, use_cache=True, fields=None):
+    """Async version of resume_to_json (PDF parsing runs in a worker thread)."""
+    fields = list(fields or RESUME_FIELDS)
+    key = resume_cache_key(input_path, resume_text, fields) if use_cache else None
+    if key:
+        cached = get_result_cache().get(key)
+        if cached is not None:
+            return cached
+    
+    resume_text, _ = await asyncio.to_thread(prepare_resume_text, input_path, resume_text)
+    fast, remaining = split_fields(resume_text, fields)
+    
+    llm_data, llm_seconds = {}, None
+    if remaining:
+        check_api_key()
+        llm = get_chat_model(RESUME_MODEL, temperature=0)
+        started = time.perf_counter()
+        pipeline = get_resume_prompt(tuple(remaining)) | llm
+        output_message = await pipeline.ainvoke({"text": resume_text})
+        llm_seconds = time.perf_counter() - started
+        llm_data = parse_resume_json(output_message.content.strip())
+    
+    record_fast_path(fields, fast, llm_seconds)
+    result_str = json.dumps(merge_fields(fields, fast, llm_data))
+    if key:
+        cache_result(key, result_str)
+    return result_str
+
+def parse_resume_json(result_str):
+    try:
+        return json.loads(result_str)
+    except json.JSONDecodeError:
+        # Auto-fix common cases like ```json wrappers
+        cleaned = result_str.strip().replace("```json", "").replace("```", "")
+        return json.loads(cleaned)
+
+async def batch_resume_to_json(input_dir, output_path, concurrency=8):
+    """
+    Extract every PDF in input_dir concurrently (at most `concurrency`
+    requests in flight) and append one JSON line per resume to output_path
+    as soon as it finishes: {"file", "ok": true, "data", "seconds"} or
+    {"file", "ok": false, "error", "seconds"}.
+    Returns (succeeded, failed) counts.
+    """
+    check_api_key()
+    
+    queue = asyncio.Queue()
+    for pdf_path in sorted(Path(input_dir).glob("*.pdf")):
+        queue.put_nowait(pdf_path)
+    
+    counts = {'ok': 0, 'failed': 0}
+    
+    with open(output_path, "a", encoding="utf-8") as out:
+        async def worker():
+            while True:
+                try:
+                    pdf_path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                started = time.perf_counter()
+                record = {'file': str(pdf_path)}
+                try:
+                    result_str = await aresume_to_json(input_path=str(pdf_path))
+                    record.update(ok=True, data=parse_resume_json(result_str))
+                    counts['ok'] += 1
+                except Exception as e:
+                    record.update(ok=False, error=f"{type(e).__name__}: {e}")
+                    counts['failed'] += 1
+                record['seconds'] = round(time.perf_counter() - started, 3)
+                
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+        
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    
+    return counts['ok'], counts['failed']
 
 def process_resume(input_path=None, resume_text=None):
     """
@@ -74,9 +348,7 @@ def process_resume(input_path=None, resume_text=None):
             data = json.loads(result_str)
         except json.JSONDecodeError:
             st.warning("⚠️ Model returned invalid JSON. Cleaning response...")
-            # Auto-fix common cases like ```json wrappers
-            cleaned = result_str.strip().replace("```json", "").replace("```", "")
-            data = json.loads(cleaned)
+            data = parse_resume_json(result_str)
         
         return data, result_str
         
@@ -85,6 +357,293 @@ def process_resume(input_path=None, resume_text=None):
         traceback.print_exc()
         return None, None
 
+class IncrementalJSONParser:
+    """
+    Incremental parser for a flat JSON object arriving in chunks.
+    feed() returns the (key, value) pairs of top-level fields that completed
+    in that chunk, and raises ValueError as soon as the text can no longer
+    be a JSON object (instead of after the whole response).
+    A leading ```json fence is tolerated; anything after the closing brace
+    is ignored.
+    """
+    
+    def __init__(self):
+        self.buf = ""
+        self.pos = 0
+        self.started = False
+        self.done = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.state = "key"
+        self.key = None
+        self.key_start = None
+        self.value_start = None
+        self.data = {}
+    
+    def _start(self):
+        rest = self.buf[self.pos:]
+        stripped = rest.lstrip()
+        if not stripped:
+            return False
+        if stripped.startswith("`"):
+            if "\n" not in stripped:
+                return False  # wait for the rest of the fence line
+            self.pos += len(rest) - len(stripped) + stripped.index("\n") + 1
+            return self._start()
+        if stripped[0] != "{":
+            raise ValueError(f"Expected a JSON object, got {stripped[:20]!r}")
+        self.pos += len(rest) - len(stripped) + 1
+        self.started = True
+        self.depth = 1
+        return True
+    
+    def _finish_value(self, end):
+        raw = self.buf[self.value_start:end].strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON value for {self.key!r}: {e}") from None
+        self.data[self.key] = value
+        return self.key, value
+    
+    def feed(self, chunk):
+        completed = []
+        if self.done:
+            return completed
+        self.buf += chunk
+        if not self.started and not self._start():
+            return completed
+        
+        i = self.pos
+        while i < len(self.buf) and not self.done:
+            c = self.buf[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.state == "key":
+                        self.key = json.loads(self.buf[self.key_start:i + 1])
+                        self.state = "colon"
+            elif c == '"':
+                self.in_string = True
+                if self.depth == 1 and self.state == "key":
+                    self.key_start = i
+            elif self.depth == 1 and self.state == "colon":
+                if c == ":":
+                    self.state = "value"
+                    self.value_start = i + 1
+                elif not c.isspace():
+                    raise ValueError(f"Expected ':' after {self.key!r}, got {c!r}")
+            elif self.depth == 1 and self.state == "key" and c not in "}," and not c.isspace():
+                raise ValueError(f"Expected a field name, got {c!r}")
+            elif c in "{[":
+                self.depth += 1
+            elif c in "}]":
+                if self.depth == 1:
+                    if c != "}":
+                        raise ValueError("Unbalanced ']' in JSON object")
+                    if self.state == "value":
+                        completed.append(self._finish_value(i))
+                    self.depth = 0
+                    self.done = True
+                else:
+                    self.depth -= 1
+            elif c == "," and self.depth == 1 and self.state == "value":
+                completed.append(self._finish_value(i))
+                self.state = "key"
+            i += 1
+        
+        self.pos = i
+        return completed
+    
+    def close(self):
+        if not self.done:
+            raise ValueError("Model response ended before the JSON object was complete")
+        return self.data
+
+def process_resume_streaming(input_path=None, resume_text=None, on_field=None, fields=None):
+    """
+    Stream the extraction, calling on_field(key, value) as each top-level
+    field completes (fast-path contact fields first, then LLM fields).
+    Returns (data, raw_result, metrics) where metrics has
+    time_to_first_field, total_seconds, cache_hit, tokens and fast_fields;
+    data is None on failure.
+    """
+    fields = list(fields or RESUME_FIELDS)
+    started = time.perf_counter()
+    metrics = {'time_to_first_field': None, 'total_seconds': None, 'cache_hit': False, 'tokens': {}, 'fast_fields': []}
+    parser = IncrementalJSONParser()
+    raw_parts = []
+    
+    def emit(field, value):
+        if metrics['time_to_first_field'] is None:
+            metrics['time_to_first_field'] = time.perf_counter() - started
+        if on_field:
+            on_field(field, value)
+    
+    try:
+        cache_key = resume_cache_key(input_path, resume_text, fields)
+        cached = get_result_cache().get(cache_key)
+        if cached is not None:
+            data = parse_resume_json(cached)
+            metrics['cache_hit'] = True
+            for field, value in data.items():
+                emit(field, value)
+            metrics['total_seconds'] = time.perf_counter() - started
+            return data, cached, metrics
+        
+        prepared_text, metrics['tokens'] = prepare_resume_text(input_path, resume_text)
+        fast, remaining = split_fields(prepared_text, fields)
+        metrics['fast_fields'] = list(fast)
+        for field, value in fast.items():
+            emit(field, value)
+        
+        llm_data, llm_seconds = {}, None
+        if remaining:
+            llm_started = time.perf_counter()
+            for token in stream_resume_fields(prepared_text, remaining):
+                raw_parts.append(token)
+                for field, value in parser.feed(token):
+                    emit(field, value)
+                if parser.done:
+                    break
+            llm_data = parser.close()
+            llm_seconds = time.perf_counter() - llm_started
+        
+        record_fast_path(fields, fast, llm_seconds)
+        data = merge_fields(fields, fast, llm_data)
+        cache_result(cache_key, json.dumps(data))
+        
+    except Exception as e:
+        st.error(f"Error: {e}")
+        traceback.print_exc()
+        data = None
+    
+    metrics['total_seconds'] = time.perf_counter() - started
+    return data, "".join(raw_parts), metrics
+
+def render_field(placeholder, key, value):
+    with placeholder.container():
+        if key in ("Name", "Email", "Phone"):
+            st.write(f"**{key}:** {value or 'Not found'}")
+        elif key == "Education":
+            st.write("**🎓 Education**")
+            if isinstance(value, list):
+                for edu in value:
+                    st.write(f"• {edu}")
+            else:
+                st.write(value or "Not found")
+        elif key == "Experience":
+            st.write("**💼 Experience**")
+            if value:
+                for i, exp in enumerate(value):
+                    st.write(f"**{i+1}.** {exp}")
+            else:
+                st.write("No experience found")
+        elif key == "Skills":
+            st.write("**🛠️ Skills**")
+            if value:
+                # Display skills as tags
+                st.write(" • ".join(value))
+            else:
+                st.write("No skills found")
+
+FIELD_LAYOUT = {
+    'left': ["Name", "Email", "Phone"],
+    'right': ["Education"],
+    'below': ["Experience", "Skills"],
+}
+
+def field_placeholders():
+    """Empty slots for every field, laid out as in the results view."""
+    placeholders = {}
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**👤 Personal Information**")
+        for key in FIELD_LAYOUT['left']:
+            placeholders[key] = st.empty()
+    with col2:
+        for key in FIELD_LAYOUT['right']:
+            placeholders[key] = st.empty()
+    for key in FIELD_LAYOUT['below']:
+        placeholders[key] = st.empty()
+    return placeholders
+
+def extract_with_live_fields(input_path=None, resume_text=None, fields=None):
+    """
+    Run the streaming extraction, showing each field as soon as it arrives.
+    Returns {'data', 'raw', 'metrics'}, or None if extraction failed.
+    """
+    live = st.empty()
+    with live.container():
+        st.subheader("📊 Extracted Information")
+        st.info("⏳ Extracting information... fields appear as soon as they are ready.")
+        placeholders = field_placeholders()
+    
+    def on_field(key, value):
+        if key in placeholders:
+            render_field(placeholders[key], key, value)
+    
+    data, raw_result, metrics = process_resume_streaming(
+        input_path=input_path, resume_text=resume_text, on_field=on_field, fields=fields
+    )
+    # The stored result is rendered by render_extraction from here on
+    live.empty()
+    if data is None:
+        return None
+    return {'data': data, 'raw': raw_result, 'metrics': metrics}
+
+def render_extraction(result, fields, output_filename):
+    data, raw_result, metrics = result['data'], result['raw'], result['metrics']
+    st.success("✅ Extraction completed!")
+    
+    for key, placeholder in field_placeholders().items():
+        if key in fields:
+            render_field(placeholder, key, data.get(key))
+    
+    if metrics['fast_fields']:
+        st.caption(f"⚡ Regex fast path filled: {', '.join(metrics['fast_fields'])}")
+    
+    if metrics['cache_hit']:
+        st.info("⚡ Served from cache: this resume was already extracted with the current prompt and model.")
+    
+    tokens = metrics['tokens']
+    if tokens:
+        saved = tokens['tokens_before'] - tokens['tokens_after']
+        st.caption(
+            f"✂️ Input tokens: {tokens['tokens_before']} → {tokens['tokens_after']} ({saved} saved"
+            + (", truncated to budget)" if tokens['truncated'] else ")")
+        )
+    
+    first_field = metrics['time_to_first_field']
+    st.caption(
+        f"⏱️ Time to first field: {first_field:.2f}s | Total: {metrics['total_seconds']:.2f}s"
+        if first_field is not None else f"⏱️ Total: {metrics['total_seconds']:.2f}s"
+    )
+    
+    # JSON Output
+    st.subheader("📋 JSON Output")
+    pretty_json = json.dumps(data, indent=4)
+    
+    # Display JSON in code block
+    st.code(pretty_json, language='json')
+    
+    # Download button
+    st.download_button(
+        label="📥 Download JSON",
+        data=pretty_json,
+        file_name=output_filename,
+        mime="application/json"
+    )
+    
+    # Raw response (expandable)
+    with st.expander("🔍 Raw Model Response"):
+        st.text(raw_result)
+
 # Streamlit App
 def main():
     st.title("📄 Resume to JSON Extractor")
@@ -97,7 +656,7 @@ def main():
         ["Upload PDF file", "Enter text directly"]
     )
     
-    resume_file_path = None
+    uploaded_file = None
     resume_text = None
     
     if input_method == "Upload PDF file":
@@ -108,10 +667,6 @@ def main():
         )
         
         if uploaded_file is not None:
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                resume_file_path = tmp_file.name
             st.success(f"✅ PDF uploaded: {uploaded_file.name}")
     
     else:
@@ -130,11 +685,25 @@ def main():
         value="resume_output.json",
         help="Name for the downloaded JSON file"
     )
+    contact_only = st.checkbox(
+        "📇 Contact fields only (Name, Email, Phone)",
+        value=False,
+        help="Email and Phone come from the local regex extractor; only Name is asked of the LLM"
+    )
+    fields = CONTACT_FIELDS if contact_only else list(RESUME_FIELDS)
+    
+    # Results are kept per input fingerprint, so reruns from other widgets (e.g.
+    # editing the output filename) re-render them without re-reading or re-extracting
+    results_key = None
+    if input_method == "Upload PDF file" and uploaded_file is not None:
+        results_key = fingerprint(input_method, uploaded_file.getvalue(), fields)
+    elif input_method == "Enter text directly" and resume_text and resume_text.strip():
+        results_key = fingerprint(input_method, resume_text, fields)
     
     # Submit button
     if st.button("🚀 Extract to JSON", type="primary"):
         # Validation
-        if input_method == "Upload PDF file" and resume_file_path is None:
+        if input_method == "Upload PDF file" and uploaded_file is None:
             st.error("❌ Please upload a PDF file.")
             return
         
@@ -142,82 +711,32 @@ def main():
             st.error("❌ Please enter resume text.")
             return
         
-        try:
-            # Show loading spinner
-            with st.spinner("Extracting information... Please wait."):
-                if input_method == "Upload PDF file":
-                    data, raw_result = process_resume(input_path=resume_file_path)
-                    # Clean up temporary file
-                    os.unlink(resume_file_path)
-                else:
-                    data, raw_result = process_resume(resume_text=resume_text)
-            
-            if data is not None:
-                st.success("✅ Extraction completed!")
-                
-                # Display structured results
-                st.subheader("📊 Extracted Information")
-                
-                # Personal Information
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("**👤 Personal Information**")
-                    st.write(f"**Name:** {data.get('Name', 'Not found')}")
-                    st.write(f"**Email:** {data.get('Email', 'Not found')}")
-                    st.write(f"**Phone:** {data.get('Phone', 'Not found')}")
-                
-                with col2:
-                    st.write("**🎓 Education**")
-                    education = data.get('Education', 'Not found')
-                    if isinstance(education, list):
-                        for edu in education:
-                            st.write(f"• {edu}")
-                    else:
-                        st.write(education)
-                
-                # Experience
-                st.write("**💼 Experience**")
-                experience = data.get('Experience', [])
-                if experience:
-                    for i, exp in enumerate(experience):
-                        st.write(f"**{i+1}.** {exp}")
-                else:
-                    st.write("No experience found")
-                
-                # Skills
-                st.write("**🛠️ Skills**")
-                skills = data.get('Skills', [])
-                if skills:
-                    # Display skills as tags
-                    skills_text = " • ".join(skills)
-                    st.write(skills_text)
-                else:
-                    st.write("No skills found")
-                
-                # JSON Output
-                st.subheader("📋 JSON Output")
-                pretty_json = json.dumps(data, indent=4)
-                
-                # Display JSON in code block
-                st.code(pretty_json, language='json')
-                
-                # Download button
-                st.download_button(
-                    label="📥 Download JSON",
-                    data=pretty_json,
-                    file_name=output_filename,
-                    mime="application/json"
-                )
-                
-                # Raw response (expandable)
-                with st.expander("🔍 Raw Model Response"):
-                    st.text(raw_result)
+        def compute():
+            if input_method == "Enter text directly":
+                return extract_with_live_fields(resume_text=resume_text, fields=fields)
             
+            # Save uploaded file temporarily
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+                tmp_file.write(uploaded_file.getvalue())
+                resume_file_path = tmp_file.name
+            try:
+                return extract_with_live_fields(input_path=resume_file_path, fields=fields)
+            finally:
+                # Clean up temporary file
+                os.unlink(resume_file_path)
+        
+        try:
+            run_cached("resume_extractor", results_key, compute)
         except Exception as e:
             st.error(f"❌ An error occurred: {str(e)}")
             st.error("Please check your OpenAI API key and ensure all dependencies are installed.")
     
+    result = session_result("resume_extractor", results_key) if results_key else None
+    if result is not None:
+        # Display structured results
+        st.subheader("📊 Extracted Information")
+        render_extraction(result, fields, output_filename)
+    
     # Sidebar with information
     with st.sidebar:
         st.header("ℹ️ How it works")
@@ -241,17 +760,46 @@ def main():
         ''', language='json')
         
         st.header("⚙️ Requirements")
-        st.code("pip install streamlit langchain-openai PyPDF2 python-dotenv")
+        st.code("pip install streamlit langchain-openai pypdfium2 python-dotenv")
         
         st.header("🔑 API Key")
         st.write("Make sure to set your OpenAI API key in a .env file:")
         st.code('OPENAI_API_KEY="sk-..."')
         
+        st.header("⚡ Contact Fast Path")
+        fast_stats = fast_path_summary()
+        st.write(
+            f"Hit rate: {fast_stats['hit_rate']:.0%} of requested fields | "
+            f"LLM calls skipped: {fast_stats['llm_skipped']} | "
+            f"Est. time saved: {fast_stats['estimated_seconds_saved']:.1f}s"
+        )
+        
         st.header("📄 Supported Formats")
         st.write("""
         - PDF files (upload)
         - Plain text (direct input)
         """)
 
+def cli():
+    """
+    Batch mode:
+        python resume_extractor_st.py batch resumes/ --output resumes.jsonl --concurrency 16
+    """
+    parser = argparse.ArgumentParser(description="Resume to JSON extractor")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    batch = subparsers.add_parser("batch", help="Extract every PDF in a folder to JSONL")
+    batch.add_argument("input_dir", help="Folder containing PDF resumes")
+    batch.add_argument("--output", default="resumes.jsonl", help="JSONL file to append results to")
+    batch.add_argument("--concurrency", type=int, default=8, help="Maximum concurrent LLM requests")
+    
+    args = parser.parse_args()
+    started = time.perf_counter()
+    ok, failed = asyncio.run(batch_resume_to_json(args.input_dir, args.output, args.concurrency))
+    print(f"Processed {ok + failed} resumes ({ok} ok, {failed} failed) in {time.perf_counter() - started:.1f}s -> {args.output}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        cli()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,171 @@
+import json
+import os
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+INDEX_FILE = "index.faiss"
+META_FILE = "meta.json"
+
+
+def _normalize(vectors):
+    vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+class ResumeIndex:
+    """
+    Persistent top-k resume vector index built on faiss.
+
+    Small corpora use an exact inner-product index. Once the corpus reaches
+    train_threshold vectors it is converted to an IVF index so that queries
+    only scan nprobe of nlist clusters instead of every resume. The IVF
+    index is retrained with a larger nlist each time the corpus grows
+    retrain_factor times past its last training, so the share of the
+    corpus a query scans keeps shrinking as it grows.
+    Vectors are L2-normalised, so scores are cosine similarities.
+    """
+
+    def __init__(self, dim, train_threshold=10000, nprobe=16, retrain_factor=4):
+        self.dim = dim
+        self.train_threshold = train_threshold
+        self.nprobe = nprobe
+        self.retrain_factor = retrain_factor
+        self.trained_size = 0
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.key_to_id = {}
+        self.id_to_key = {}
+        self.next_id = 0
+
+    def __len__(self):
+        return self.index.ntotal
+
+    def __contains__(self, key):
+        return key in self.key_to_id
+
+    @property
+    def is_ivf(self):
+        return isinstance(self.index, faiss.IndexIVF)
+
+    def add(self, keys, vectors):
+        """Add (or replace) resumes. keys are any JSON-serialisable strings."""
+        keys = list(keys)
+        vectors = _normalize(vectors)
+        if len(keys) != len(vectors):
+            raise ValueError("keys and vectors must have the same length")
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        # A key repeated within one call keeps its last vector
+        last = {key: row for row, key in enumerate(keys)}
+        if len(last) < len(keys):
+            keys = list(last)
+            vectors = vectors[list(last.values())]
+
+        existing = [k for k in keys if k in self.key_to_id]
+        if existing:
+            self.delete(existing)
+
+        ids = np.arange(self.next_id, self.next_id + len(keys), dtype=np.int64)
+        self.next_id += len(keys)
+        for key, id_ in zip(keys, ids):
+            self.key_to_id[key] = int(id_)
+            self.id_to_key[int(id_)] = key
+
+        self.index.add_with_ids(vectors, ids)
+
+        if not self.is_ivf and len(self) >= self.train_threshold:
+            self._train_ivf()
+        elif self.is_ivf and len(self) >= self.retrain_factor * self.trained_size:
+            self._train_ivf()
+
+    def update(self, keys, vectors):
+        self.add(keys, vectors)
+
+    def delete(self, keys):
+        ids = [self.key_to_id.pop(k) for k in keys if k in self.key_to_id]
+        for id_ in ids:
+            del self.id_to_key[id_]
+        if ids:
+            self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+        return len(ids)
+
+    def search(self, query_vector, k=50):
+        """Return [(key, score), ...] for the k most similar resumes."""
+        if len(self) == 0:
+            return []
+        query = _normalize(query_vector)
+        if self.is_ivf:
+            self.index.nprobe = self.nprobe
+        scores, ids = self.index.search(query, min(k, len(self)))
+        return [
+            (self.id_to_key[int(id_)], float(score))
+            for score, id_ in zip(scores[0], ids[0])
+            if id_ != -1
+        ]
+
+    def _train_ivf(self):
+        """(Re)build the IVF index over every stored vector, sizing nlist to the corpus."""
+        if self.is_ivf:
+            if self.index.direct_map.type != faiss.DirectMap.Hashtable:
+                # Indexes saved before the direct map was kept
+                self.index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            ids = np.fromiter(self.id_to_key, dtype=np.int64, count=len(self.id_to_key))
+            vectors = self.index.reconstruct_batch(ids)
+        else:
+            ids = faiss.vector_to_array(self.index.id_map).astype(np.int64)
+            vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+
+        # faiss wants ~39 training points per centroid
+        nlist = max(1, min(int(4 * np.sqrt(len(ids))), len(ids) // 39))
+        quantizer = faiss.IndexFlatIP(self.dim)
+        ivf = faiss.IndexIVFFlat(quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(vectors)
+        # Lets a later retrain reconstruct vectors by id
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        ivf.add_with_ids(vectors, ids)
+        self.index = ivf
+        self.trained_size = len(ids)
+
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self.index, str(directory / INDEX_FILE))
+        meta = {
+            'dim': self.dim,
+            'train_threshold': self.train_threshold,
+            'nprobe': self.nprobe,
+            'retrain_factor': self.retrain_factor,
+            'trained_size': self.trained_size,
+            'next_id': self.next_id,
+            'keys': {str(id_): key for id_, key in self.id_to_key.items()},
+        }
+        tmp_path = directory / (META_FILE + ".tmp")
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, directory / META_FILE)
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        meta = json.loads((directory / META_FILE).read_text())
+        obj = cls(
+            meta['dim'],
+            train_threshold=meta['train_threshold'],
+            nprobe=meta['nprobe'],
+            retrain_factor=meta.get('retrain_factor', 4),
+        )
+        obj.index = faiss.read_index(str(directory / INDEX_FILE))
+        # Older saves don't record it; treat the current size as trained
+        obj.trained_size = meta.get('trained_size', obj.index.ntotal if obj.is_ivf else 0)
+        obj.next_id = meta['next_id']
+        obj.id_to_key = {int(id_): key for id_, key in meta['keys'].items()}
+        obj.key_to_id = {key: id_ for id_, key in obj.id_to_key.items()}
+        return obj
+
+    @classmethod
+    def load_or_create(cls, directory, dim, **kwargs):
+        if (Path(directory) / META_FILE).exists():
+            return cls.load(directory)
+        return cls(dim, **kwargs)
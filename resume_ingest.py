@@ -0,0 +1,189 @@
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from resume_text import read_resume
+from utils import load_json_state, save_json_state
+
+RESUME_SUFFIXES = {".pdf", ".docx", ".txt"}
+DEFAULT_STATE_FILE = ".ingest_state.json"
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _extract(path, timeout):
+    # Per-file timeout is enforced inside the worker with SIGALRM, so a stuck
+    # PDF cannot block the pool. Windows has no SIGALRM: there the timeout is
+    # not applied (ingest_resumes warns about it).
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return read_resume(path)
+    except ExtractionTimeout:
+        raise TimeoutError(f"extraction exceeded {timeout}s") from None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _iter_directory(root):
+    """Yield (key, mtime, size, path, read_bytes) for resumes under root."""
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if Path(name).suffix.lower() not in RESUME_SUFFIXES:
+                continue
+            st = os.stat(path)
+            yield path, st.st_mtime, st.st_size, path, None
+
+
+def _iter_archive(archive):
+    """Yield (key, mtime, size, None, read_bytes) for resumes inside a zip/tar."""
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or Path(info.filename).suffix.lower() not in RESUME_SUFFIXES:
+                    continue
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                yield (f"{archive}::{info.filename}", mtime, info.file_size, None,
+                       lambda info=info: zf.read(info))
+    else:
+        with tarfile.open(archive) as tf:
+            for member in tf:
+                if not member.isfile() or Path(member.name).suffix.lower() not in RESUME_SUFFIXES:
+                    continue
+                yield (f"{archive}::{member.name}", float(member.mtime), member.size, None,
+                       lambda member=member: tf.extractfile(member).read())
+
+
+def ingest_resumes(source, state_file=DEFAULT_STATE_FILE, max_workers=None, timeout=60, force=False):
+    """
+    Extract text from every .pdf/.docx/.txt resume in a directory or a
+    .zip/.tar archive using a process pool, yielding (path, text) as each
+    file finishes.
+
+    Files whose mtime and size match the previous run are skipped without
+    being read; files whose mtime changed but whose sha256 is the same are
+    skipped after hashing. Failed or timed-out files are reported on stderr
+    and retried on the next run. The per-file timeout needs SIGALRM, so it
+    is not enforced on Windows.
+    """
+    if timeout and not hasattr(signal, "SIGALRM"):
+        print(f"Warning: per-file timeout ({timeout}s) is not supported on this platform; "
+              "a stuck file will hold its worker until it finishes", file=sys.stderr)
+
+    source = str(source)
+    state = {} if force else load_json_state(state_file)
+    seen = set()
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    entries = _iter_directory(source) if os.path.isdir(source) else _iter_archive(source)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            pending = {}
+            window = (max_workers or os.cpu_count() or 1) * 4
+
+            def drain(return_when):
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    key, record = pending.pop(future)
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        print(f"Failed to ingest {key}: {e}", file=sys.stderr)
+                        continue
+                    state[key] = record
+                    yield key, text
+
+            for key, mtime, size, path, read_bytes in entries:
+                seen.add(key)
+                previous = state.get(key)
+                if previous and previous['mtime'] == mtime and previous['size'] == size:
+                    continue
+
+                if read_bytes is not None:
+                    data = read_bytes()
+                    digest = _sha256_bytes(data)
+                else:
+                    digest = _sha256_file(path)
+
+                record = {'mtime': mtime, 'size': size, 'sha256': digest}
+                if previous and previous['sha256'] == digest:
+                    state[key] = record
+                    continue
+
+                if read_bytes is not None:
+                    path = os.path.join(tmp_dir.name, f"{digest}{Path(key).suffix.lower()}")
+                    with open(path, "wb") as f:
+                        f.write(data)
+
+                pending[pool.submit(_extract, path, timeout)] = (key, record)
+                if len(pending) >= window:
+                    yield from drain(FIRST_COMPLETED)
+
+            while pending:
+                yield from drain(FIRST_COMPLETED)
+
+        # Forget files that disappeared from the source
+        prefix = f"{source}::"
+        for key in list(state):
+            in_source = key.startswith(prefix) or key.startswith(os.path.join(source, ""))
+            if in_source and key not in seen:
+                del state[key]
+
+    finally:
+        save_json_state(state_file, state)
+        tmp_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally extract text from a folder or archive of resumes.")
+    parser.add_argument("source", help="Directory or .zip/.tar archive of resumes")
+    parser.add_argument("output", help="JSONL file to append {path, text} records to")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="Per-file extraction limit in seconds (not enforced on Windows)")
+    parser.add_argument("--force", action="store_true", help="Re-ingest every file")
+    args = parser.parse_args()
+
+    count = 0
+    with open(args.output, "a", encoding="utf-8") as out:
+        for path, text in ingest_resumes(args.source, args.state_file, args.workers, args.timeout, args.force):
+            out.write(json.dumps({'path': path, 'text': text}) + "\n")
+            count += 1
+    print(f"Ingested {count} new or changed resumes")
+
+
+if __name__ == "__main__":
+    main()
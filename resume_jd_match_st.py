@@ -1,54 +1,204 @@
 import streamlit as st
 import re
-from pathlib import Path
-from dotenv import load_dotenv
-from PyPDF2 import PdfReader
-import docx
-from langchain_openai import OpenAIEmbeddings
-from sklearn.metrics.pairwise import cosine_similarity
+from llm_clients import load_env
+import numpy as np
+import tiktoken
+from embedding_cache import get_embedding_cache
+from embedders import get_embedder, EMBEDDERS
+from resume_index import ResumeIndex
+from keyword_index import get_keyword_index
+from resume_text import read_resume
+from result_store import fingerprint, run_cached, session_result
+import hashlib
 import tempfile
 import os
 
 # Your original functions - unchanged
-def read_resume(file_path):
-    p = Path(file_path)
-    if not p.exists():
-        raise FileNotFoundError(f"{file_path} not found")
-        
-    if p.suffix.lower() == ".txt":
-        return p.read_text()
-        
-    elif p.suffix.lower() == ".pdf":
-        text = ""
-        reader = PdfReader(str(p))
-        for page in reader.pages:
-            text += page.extract_text() + " "
-        return text
-        
-    elif p.suffix.lower() in [".doc", ".docx"]:
-        doc = docx.Document(str(p))
-        text = " ".join([para.text for para in doc.paragraphs])
-        return text
-        
-    else:
-        raise ValueError(f"Unsupported file type: {p.suffix}")
-
 def preprocess_text(text):
     text = text.lower()
     text = re.sub(r'[^a-z0-9\s]', '', text)
     words = text.split()
     return " ".join(words)
 
-def compute_similarity(resume_text, jd_text):
-    emb = OpenAIEmbeddings()
-    resume_vec = emb.embed_query(resume_text)
-    jd_vec = emb.embed_query(jd_text)
+CHUNK_TOKENS = 512
+CHUNK_OVERLAP = 64
+POOLING_MODES = ["mean", "max", "matrix"]
+
+def chunk_text(text, max_tokens=CHUNK_TOKENS, overlap=CHUNK_OVERLAP, by="tokens"):
+    """
+    Split text into overlapping windows of at most max_tokens tokens
+    (or words, with by="words", which needs no tokenizer).
+    """
+    if by == "words":
+        words = text.split()
+        if len(words) <= max_tokens:
+            return [text]
+        step = max_tokens - overlap
+        return [" ".join(words[i:i + max_tokens]) for i in range(0, len(words) - overlap, step)]
+    
+    enc = tiktoken.get_encoding("cl100k_base")
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return [text]
+    
+    step = max_tokens - overlap
+    return [enc.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens) - overlap, step)]
+
+def embed_chunked(emb, texts):
+    """
+    Chunk every text and embed all chunks together in one batched
+    emb.embed_documents call (cache misses only, for remote backends).
+    Returns (unit-length chunk vectors, offsets) where offsets[i] is the
+    first chunk row belonging to texts[i].
+    """
+    chunks = [chunk_text(t, by=emb.chunk_by) for t in texts]
+    offsets = np.cumsum([0] + [len(c) for c in chunks[:-1]])
+    vectors = emb.embed_documents([c for cs in chunks for c in cs])
+    
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms, offsets
+
+def pool_chunks(vectors, offsets, pooling="mean"):
+    """Reduce chunk vectors to one unit vector per text."""
+    if pooling == "mean":
+        counts = np.diff(np.append(offsets, len(vectors)))[:, None]
+        pooled = np.add.reduceat(vectors, offsets, axis=0) / counts
+    elif pooling == "max":
+        pooled = np.maximum.reduceat(vectors, offsets, axis=0)
+    else:
+        raise ValueError(f"Unsupported pooling: {pooling}")
+    
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return pooled / norms
+
+def chunk_matrix_scores(resume_vecs, resume_offsets, jd_vecs):
+    """
+    Chunk-to-chunk scoring: for every JD chunk take its best matching
+    chunk in each resume, then average over the JD chunks.
+    """
+    sims = resume_vecs @ jd_vecs.T
+    best = np.maximum.reduceat(sims, resume_offsets, axis=0)
+    return best.mean(axis=1)
+
+def score_chunked(resume_texts, jd_text, pooling="mean", batch_size=500, backend=None):
+    """Score every resume text against jd_text, chunking long documents."""
+    if pooling not in POOLING_MODES:
+        raise ValueError(f"Unsupported pooling: {pooling}")
+    
+    emb = get_embedder(backend, batch_size=batch_size)
+    vectors, offsets = embed_chunked(emb, [jd_text] + list(resume_texts))
+    n_jd = offsets[1] if len(offsets) > 1 else len(vectors)
+    jd_vecs, resume_vecs = vectors[:n_jd], vectors[n_jd:]
+    resume_offsets = offsets[1:] - n_jd
     
-    # cosine similarity
-    score = cosine_similarity([resume_vec], [jd_vec])[0][0]
-    return score
+    if pooling == "matrix":
+        return chunk_matrix_scores(resume_vecs, resume_offsets, jd_vecs)
+    
+    jd_vec = pool_chunks(jd_vecs, np.array([0]), pooling)[0]
+    return pool_chunks(resume_vecs, resume_offsets, pooling) @ jd_vec
+
+def resume_key(resume_text_clean):
+    return hashlib.sha256(resume_text_clean.encode("utf-8")).hexdigest()
 
-def analyze_match(resume_file_path, jd_text):
+def compute_similarity(resume_text, jd_text, pooling="mean", backend=None):
+    return float(score_chunked([resume_text], jd_text, pooling=pooling, backend=backend)[0])
+
+def rank_resumes(jd_text, resume_paths, batch_size=500, pooling="mean", backend=None, shortlist=None):
+    """
+    Rank many resumes against one job description in a single pass.
+    The JD is embedded once, all resume chunks go through batched
+    embed_documents calls, and scores come from one matrix product.
+    With shortlist=N every resume is first pre-screened with the local
+    embedder and only the best N are re-scored with backend.
+    Returns a list of dicts sorted by similarity_score (best first).
+    """
+    load_env()
+    
+    resume_paths = list(resume_paths)
+    if not resume_paths:
+        return []
+    
+    resume_texts = [preprocess_text(read_resume(p)) for p in resume_paths]
+    jd_text_clean = preprocess_text(jd_text)
+    
+    if shortlist and shortlist < len(resume_texts):
+        prescreen = score_chunked(resume_texts, jd_text_clean, pooling=pooling, backend="local")
+        keep = np.sort(np.argsort(-prescreen, kind="stable")[:shortlist])
+        resume_paths = [resume_paths[i] for i in keep]
+        resume_texts = [resume_texts[i] for i in keep]
+    
+    scores = score_chunked(resume_texts, jd_text_clean, pooling=pooling, batch_size=batch_size, backend=backend)
+    
+    keywords = get_keyword_index()
+    keys = [resume_key(t) for t in resume_texts]
+    keywords.add(keys, resume_texts)
+    keyword_matches = keywords.match(jd_text_clean, keys=keys, top_n=10)
+    
+    order = np.argsort(-scores, kind="stable")
+    return [
+        {
+            'rank': rank,
+            'resume_path': resume_paths[i],
+            'similarity_score': float(scores[i]),
+            'keyword_score': keyword_matches[i]['keyword_score'],
+            'missing_keywords': keyword_matches[i]['missing_keywords'],
+        }
+        for rank, i in enumerate(order, 1)
+    ]
+
+RESUME_INDEX_DIR = os.getenv("RESUME_INDEX_DIR", "resume_index")
+
+def index_resumes(resume_paths, index_dir=RESUME_INDEX_DIR, backend=None):
+    """
+    Add (or re-index) resumes in the persistent vector index.
+    Each resume is keyed by its path. Every embedding backend gets its
+    own index under index_dir.
+    """
+    load_env()
+    
+    resume_paths = [str(p) for p in resume_paths]
+    if not resume_paths:
+        return 0
+    
+    resume_texts = [preprocess_text(read_resume(p)) for p in resume_paths]
+    emb = get_embedder(backend)
+    resume_vecs = pool_chunks(*embed_chunked(emb, resume_texts))
+    
+    backend_dir = os.path.join(index_dir, emb.name)
+    index = ResumeIndex.load_or_create(backend_dir, dim=resume_vecs.shape[1])
+    index.add(resume_paths, resume_vecs)
+    index.save(backend_dir)
+    return len(resume_paths)
+
+def remove_resumes(resume_paths, index_dir=RESUME_INDEX_DIR):
+    removed = 0
+    for name in EMBEDDERS:
+        backend_dir = os.path.join(index_dir, name)
+        if not os.path.isdir(backend_dir):
+            continue
+        index = ResumeIndex.load(backend_dir)
+        removed += index.delete([str(p) for p in resume_paths])
+        index.save(backend_dir)
+    return removed
+
+def search_candidates(jd_text, k=50, index_dir=RESUME_INDEX_DIR, backend=None):
+    """
+    Return the top-k indexed resumes for a job description as
+    [{'rank', 'resume_path', 'similarity_score'}, ...].
+    """
+    load_env()
+    
+    emb = get_embedder(backend)
+    index = ResumeIndex.load(os.path.join(index_dir, emb.name))
+    jd_vec = pool_chunks(*embed_chunked(emb, [preprocess_text(jd_text)]))
+    return [
+        {'rank': rank, 'resume_path': path, 'similarity_score': score}
+        for rank, (path, score) in enumerate(index.search(jd_vec, k), 1)
+    ]
+
+def analyze_match(resume_file_path, jd_text, pooling="mean", backend=None):
     """
     Resume vs Job Description Matching using LangChain embeddings.
     Supports: .txt, .pdf, .doc/.docx resumes
@@ -58,7 +208,7 @@ def analyze_match(resume_file_path, jd_text):
     """
     
     # Load .env variables
-    load_dotenv()
+    load_env()
     
     resume_text = read_resume(resume_file_path)
     
@@ -67,22 +217,156 @@ def analyze_match(resume_file_path, jd_text):
     jd_text_clean = preprocess_text(jd_text)
     
     # Compute semantic similarity
-    similarity_score = compute_similarity(resume_text_clean, jd_text_clean)
+    similarity_score = compute_similarity(resume_text_clean, jd_text_clean, pooling=pooling, backend=backend)
     
-    # Optional: simple keyword overlap for reference
-    resume_words = set(resume_text_clean.split())
-    jd_words = set(jd_text_clean.split())
-    matching_keywords = resume_words.intersection(jd_words)
+    # TF-IDF weighted keyword overlap against the whole resume corpus
+    keywords = get_keyword_index()
+    key = resume_key(resume_text_clean)
+    keywords.add([key], [resume_text_clean])
+    keyword_match = keywords.match(jd_text_clean, keys=[key])[0]
+    jd_terms = set(keyword_match['matching_keywords']) | set(keyword_match['missing_keywords'])
     
     return {
         'similarity_score': similarity_score,
-        'matching_keywords': matching_keywords,
-        'resume_only_keywords': resume_words - jd_words,
-        'jd_only_keywords': jd_words - resume_words,
+        'keyword_score': keyword_match['keyword_score'],
+        'matching_keywords': keyword_match['matching_keywords'],
+        'resume_only_keywords': keywords.resume_terms(key) - jd_terms,
+        'jd_only_keywords': keyword_match['missing_keywords'],
         'resume_text': resume_text,
         'jd_text': jd_text
     }
 
+def rank_uploaded_resumes(resume_files, jd_text, pooling="mean", backend=None, shortlist=None):
+    if not resume_files:
+        st.error("❌ Please upload at least one resume file.")
+        return
+    
+    if not jd_text.strip():
+        st.error("❌ Please provide a job description.")
+        return
+    
+    temp_paths = {}
+    try:
+        # Save uploaded resume files temporarily
+        for f in resume_files:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{f.name.split('.')[-1]}") as tmp_file:
+                tmp_file.write(f.getvalue())
+                temp_paths[tmp_file.name] = f.name
+        
+        with st.spinner(f"Ranking {len(resume_files)} resumes... Please wait."):
+            leaderboard = rank_resumes(jd_text, list(temp_paths), pooling=pooling, backend=backend, shortlist=shortlist)
+        
+        return [
+            {
+                'Rank': row['rank'],
+                'Resume': temp_paths[row['resume_path']],
+                'Score': round(row['similarity_score'], 4),
+                'Keyword Coverage': round(row['keyword_score'], 4),
+                'Top Missing Keywords': ", ".join(row['missing_keywords']),
+            }
+            for row in leaderboard
+        ]
+        
+    except Exception as e:
+        st.error(f"❌ An error occurred: {str(e)}")
+        st.error("Please check your OpenAI API key and ensure all dependencies are installed.")
+    
+    finally:
+        # Clean up temporary files
+        for path in temp_paths:
+            os.unlink(path)
+
+def render_leaderboard(rows):
+    st.success("✅ Ranking completed!")
+    st.subheader("🏆 Resume Leaderboard")
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+
+def match_uploaded_resume(resume_file, jd_text, pooling="mean", backend=None):
+    try:
+        # Save uploaded resume file temporarily
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{resume_file.name.split('.')[-1]}") as tmp_file:
+            tmp_file.write(resume_file.getvalue())
+            temp_resume_path = tmp_file.name
+        
+        # Show loading spinner
+        with st.spinner("Analyzing match... Please wait."):
+            result = analyze_match(temp_resume_path, jd_text, pooling=pooling, backend=backend)
+        
+        # Clean up temporary file
+        os.unlink(temp_resume_path)
+        return result
+    
+    except Exception as e:
+        st.error(f"❌ An error occurred: {str(e)}")
+        st.error("Please check your OpenAI API key and ensure all dependencies are installed.")
+
+def render_match_result(result):
+    # Display results
+    st.success("✅ Analysis completed!")
+    
+    # Main similarity score
+    st.subheader("🎯 Match Results")
+    
+    score = result['similarity_score']
+    score_color = "green" if score >= 0.7 else "orange" if score >= 0.5 else "red"
+    
+    st.markdown(f"""
+    ### Semantic Match Score: <span style="color: {score_color}; font-weight: bold;">{score:.2f}</span>
+    """, unsafe_allow_html=True)
+    
+    # Score interpretation
+    if score >= 0.8:
+        st.success("🔥 Excellent match! This resume aligns very well with the job requirements.")
+    elif score >= 0.6:
+        st.info("✨ Good match! The resume shows relevance to the job description.")
+    elif score >= 0.4:
+        st.warning("⚡ Moderate match. Some alignment but could be improved.")
+    else:
+        st.error("❌ Low match. Significant gaps between resume and job requirements.")
+    
+    # Keyword analysis
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Keyword Coverage", f"{result['keyword_score']:.0%}")
+    with col2:
+        st.metric("Matching Keywords", len(result['matching_keywords']))
+    with col3:
+        st.metric("Resume-only Keywords", len(result['resume_only_keywords']))
+    with col4:
+        st.metric("JD-only Keywords", len(result['jd_only_keywords']))
+    
+    # Detailed keyword breakdown
+    st.subheader("🔍 Keyword Analysis")
+    
+    with st.expander(f"🎯 Matching Keywords ({len(result['matching_keywords'])})", expanded=True):
+        if result['matching_keywords']:
+            # Already ordered by TF-IDF weight
+            st.write(", ".join(result['matching_keywords']))
+        else:
+            st.write("No matching keywords found")
+    
+    with st.expander(f"📄 Resume-only Keywords ({len(result['resume_only_keywords'])})"):
+        if result['resume_only_keywords']:
+            resume_only_list = sorted(list(result['resume_only_keywords']))
+            st.write(", ".join(resume_only_list))
+        else:
+            st.write("No unique resume keywords")
+    
+    with st.expander(f"📋 Job Description-only Keywords ({len(result['jd_only_keywords'])})"):
+        if result['jd_only_keywords']:
+            st.write(", ".join(result['jd_only_keywords']))
+            st.info("💡 Consider adding these keywords to your resume if they're relevant to your experience.")
+        else:
+            st.write("No unique job description keywords")
+    
+    # Raw content preview
+    with st.expander("📄 Resume Content Preview"):
+        st.text_area("Resume text:", result['resume_text'][:1000] + "..." if len(result['resume_text']) > 1000 else result['resume_text'], height=200, disabled=True)
+    
+    with st.expander("📋 Job Description Content"):
+        st.text_area("Job description text:", result['jd_text'], height=200, disabled=True)
+
 # Streamlit App
 def main():
     st.title("📄 Resume vs Job Description Matcher")
@@ -93,14 +377,32 @@ def main():
     
     with col1:
         st.subheader("📋 Upload Resume")
-        resume_file = st.file_uploader(
-            "Choose resume file", 
-            type=['txt', 'pdf', 'doc', 'docx'],
-            help="Supported formats: .txt, .pdf, .doc, .docx"
+        resume_mode = st.radio(
+            "Choose mode:",
+            ["Single resume", "Rank multiple resumes"]
         )
         
-        if resume_file is not None:
-            st.success(f"✅ Resume uploaded: {resume_file.name}")
+        resume_file = None
+        resume_files = []
+        if resume_mode == "Single resume":
+            resume_file = st.file_uploader(
+                "Choose resume file", 
+                type=['txt', 'pdf', 'doc', 'docx'],
+                help="Supported formats: .txt, .pdf, .doc, .docx"
+            )
+            
+            if resume_file is not None:
+                st.success(f"✅ Resume uploaded: {resume_file.name}")
+        else:
+            resume_files = st.file_uploader(
+                "Choose resume files",
+                type=['txt', 'pdf', 'doc', 'docx'],
+                accept_multiple_files=True,
+                help="Upload all resumes to rank against the job description"
+            ) or []
+            
+            if resume_files:
+                st.success(f"✅ {len(resume_files)} resumes uploaded")
     
     with col2:
         st.subheader("📝 Job Description")
@@ -122,104 +424,71 @@ def main():
                 jd_text = jd_file.getvalue().decode("utf-8")
                 st.success(f"✅ Job description uploaded: {jd_file.name}")
     
+    pooling = st.selectbox(
+        "Long document scoring:",
+        POOLING_MODES,
+        help="How chunk embeddings of long resumes/JDs are combined: mean or max pooling, or a chunk-to-chunk similarity matrix"
+    )
+    
+    backend = st.selectbox(
+        "Embedding backend:",
+        list(EMBEDDERS),
+        help="openai: remote OpenAI embeddings. local: in-process hashing embeddings, no network"
+    )
+    
+    shortlist = 0
+    if resume_mode == "Rank multiple resumes":
+        shortlist = st.number_input(
+            "Pre-screen shortlist size (0 = off):",
+            min_value=0,
+            value=0,
+            help="Pre-screen all resumes locally and send only the top N to the selected backend"
+        )
+    
+    # Results are kept per input fingerprint, so reruns from other widgets
+    # re-render them instead of re-reading and re-embedding the resumes
+    results_key = None
+    if resume_mode == "Rank multiple resumes" and resume_files:
+        results_key = fingerprint(
+            resume_mode, [f.name for f in resume_files], *[f.getvalue() for f in resume_files],
+            jd_text, pooling, backend, shortlist
+        )
+    elif resume_mode == "Single resume" and resume_file is not None:
+        results_key = fingerprint(resume_mode, resume_file.name, resume_file.getvalue(), jd_text, pooling, backend)
+    
     # Submit button
     if st.button("🚀 Analyze Match", type="primary"):
-        if resume_file is None:
-            st.error("❌ Please upload a resume file.")
-            return
+        if resume_mode == "Rank multiple resumes":
+            if not resume_files:
+                st.error("❌ Please upload at least one resume file.")
+                return
+            compute = lambda: rank_uploaded_resumes(resume_files, jd_text, pooling=pooling, backend=backend, shortlist=shortlist)
+        else:
+            if resume_file is None:
+                st.error("❌ Please upload a resume file.")
+                return
+            compute = lambda: match_uploaded_resume(resume_file, jd_text, pooling=pooling, backend=backend)
         
         if not jd_text.strip():
             st.error("❌ Please provide a job description.")
             return
         
-        try:
-            # Save uploaded resume file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{resume_file.name.split('.')[-1]}") as tmp_file:
-                tmp_file.write(resume_file.getvalue())
-                temp_resume_path = tmp_file.name
-            
-            # Show loading spinner
-            with st.spinner("Analyzing match... Please wait."):
-                result = analyze_match(temp_resume_path, jd_text)
-            
-            # Clean up temporary file
-            os.unlink(temp_resume_path)
-            
-            # Display results
-            st.success("✅ Analysis completed!")
-            
-            # Main similarity score
-            st.subheader("🎯 Match Results")
-            
-            score = result['similarity_score']
-            score_color = "green" if score >= 0.7 else "orange" if score >= 0.5 else "red"
-            
-            st.markdown(f"""
-            ### Semantic Match Score: <span style="color: {score_color}; font-weight: bold;">{score:.2f}</span>
-            """, unsafe_allow_html=True)
-            
-            # Score interpretation
-            if score >= 0.8:
-                st.success("🔥 Excellent match! This resume aligns very well with the job requirements.")
-            elif score >= 0.6:
-                st.info("✨ Good match! The resume shows relevance to the job description.")
-            elif score >= 0.4:
-                st.warning("⚡ Moderate match. Some alignment but could be improved.")
-            else:
-                st.error("❌ Low match. Significant gaps between resume and job requirements.")
-            
-            # Keyword analysis
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Matching Keywords", len(result['matching_keywords']))
-            with col2:
-                st.metric("Resume-only Keywords", len(result['resume_only_keywords']))
-            with col3:
-                st.metric("JD-only Keywords", len(result['jd_only_keywords']))
-            
-            # Detailed keyword breakdown
-            st.subheader("🔍 Keyword Analysis")
-            
-            with st.expander(f"🎯 Matching Keywords ({len(result['matching_keywords'])})", expanded=True):
-                if result['matching_keywords']:
-                    # Convert to sorted list for better display
-                    matching_list = sorted(list(result['matching_keywords']))
-                    st.write(", ".join(matching_list))
-                else:
-                    st.write("No matching keywords found")
-            
-            with st.expander(f"📄 Resume-only Keywords ({len(result['resume_only_keywords'])})"):
-                if result['resume_only_keywords']:
-                    resume_only_list = sorted(list(result['resume_only_keywords']))
-                    st.write(", ".join(resume_only_list))
-                else:
-                    st.write("No unique resume keywords")
-            
-            with st.expander(f"📋 Job Description-only Keywords ({len(result['jd_only_keywords'])})"):
-                if result['jd_only_keywords']:
-                    jd_only_list = sorted(list(result['jd_only_keywords']))
-                    st.write(", ".join(jd_only_list))
-                    st.info("💡 Consider adding these keywords to your resume if they're relevant to your experience.")
-                else:
-                    st.write("No unique job description keywords")
-            
-            # Raw content preview
-            with st.expander("📄 Resume Content Preview"):
-                st.text_area("Resume text:", result['resume_text'][:1000] + "..." if len(result['resume_text']) > 1000 else result['resume_text'], height=200, disabled=True)
-            
-            with st.expander("📋 Job Description Content"):
-                st.text_area("Job description text:", result['jd_text'], height=200, disabled=True)
-                
-        except Exception as e:
-            st.error(f"❌ An error occurred: {str(e)}")
-            st.error("Please check your OpenAI API key and ensure all dependencies are installed.")
+        _, reused = run_cached("resume_jd_match", results_key, compute)
+        if reused:
+            st.info("♻️ Showing results computed earlier for the same resumes and job description.")
+    
+    result = session_result("resume_jd_match", results_key) if results_key else None
+    if result is not None:
+        if resume_mode == "Rank multiple resumes":
+            render_leaderboard(result)
+        else:
+            render_match_result(result)
             
     # Sidebar with information
     with st.sidebar:
         st.header("ℹ️ How it works")
         st.write("""
-        1. **Upload Resume**: Supports .txt, .pdf, .doc, .docx
+        1. **Upload Resume**: Supports .txt, .pdf, .doc, .docx (or many resumes to rank)
         2. **Add Job Description**: Enter text or upload file
         3. **AI Analysis**: Uses OpenAI embeddings for semantic matching
         4. **Get Results**: Similarity score + keyword analysis
@@ -233,8 +502,12 @@ def main():
         - **0.0-0.4**: Low match ❌
         """)
         
+        st.header("🗄️ Embedding Cache")
+        cache_stats = get_embedding_cache().stats()
+        st.write(f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | Entries: {cache_stats['entries']}")
+        
         st.header("⚙️ Requirements")
-        st.code("pip install streamlit langchain-openai PyPDF2 python-docx scikit-learn python-dotenv")
+        st.code("pip install streamlit langchain-openai pypdfium2 python-docx scikit-learn python-dotenv diskcache tiktoken")
         
         st.header("🔑 API Key")
         st.write("Make sure to set your OpenAI API key in a .env file:")
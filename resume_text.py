@@ -0,0 +1,39 @@
+"""
+Plain-text extraction for .txt, .pdf and .docx resumes.
+
+Kept free of Streamlit, embedding and index imports so that worker
+processes (resume_ingest) only load what extraction needs.
+
+    text = read_resume("resume.pdf")
+"""
+from pathlib import Path
+
+from pdf_text import iter_pages
+from text_reduction import remove_repeated_lines
+
+
+def read_docx(path):
+    import docx
+
+    doc = docx.Document(str(path))
+    return " ".join([para.text for para in doc.paragraphs])
+
+
+def read_resume(file_path):
+    p = Path(file_path)
+    if not p.exists():
+        raise FileNotFoundError(f"{file_path} not found")
+
+    if p.suffix.lower() == ".txt":
+        return p.read_text()
+
+    elif p.suffix.lower() == ".pdf":
+        # Repeated headers/footers and page numbers add noise and tokens
+        pages = remove_repeated_lines(iter_pages(p))
+        return " ".join(pages) + " "
+
+    elif p.suffix.lower() in [".doc", ".docx"]:
+        return read_docx(p)
+
+    else:
+        raise ValueError(f"Unsupported file type: {p.suffix}")
@@ -1,6 +1,8 @@
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
+import sys
+from upload_registry import get_upload_registry
 
 # Load .env file
 load_dotenv()
@@ -10,10 +12,13 @@ client = OpenAI(
     api_key=os.environ.get("OPENAI_API_KEY")
 )
 
-file = client.files.create(
-    file=open(r"D:\GenAI-AI-AGENT\Resourses\alex-report-06-Mar-2025-1764590459524.pdf.pdf", "rb"),
-    purpose="user_data"
-)
+REPORT_PATH = os.environ.get("REPORT_PATH", r"D:\GenAI-AI-AGENT\Resourses\alex-report-06-Mar-2025-1764590459524.pdf.pdf")
+question = " ".join(sys.argv[1:]) or "What is the HbA1C level in the file?"
+
+# Reuses the file_id of an earlier upload of the same content (any run or process);
+# only uploads when the report is new or changed
+registry = get_upload_registry()
+file_id = registry.upload(client, REPORT_PATH, purpose="user_data")
 
 response = client.responses.create(
     model="gpt-5-mini",
@@ -23,11 +28,11 @@ response = client.responses.create(
             "content": [
                 {
                     "type": "input_file",
-                    "file_id": file.id,
+                    "file_id": file_id,
                 },
                 {
                     "type": "input_text",
-                    "text": "What is the HbA1C level in the file?",
+                    "text": question,
                 },
             ]
         }
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from openai import OpenAI
+
+import openai_batch
+from openai_stub_server import StubOpenAIServer
+
+
+def responder(body):
+    prompt = body['messages'][0]['content']
+    if "resume" in prompt.lower():
+        return '```json\n{"Name": "Jane Doe", "Email": "jane@doe.com"}\n```'
+    return "summary of " + prompt.rsplit("\n", 1)[-1][:20]
+
+
+@pytest.fixture
+def client():
+    with StubOpenAIServer(responder=responder) as server:
+        yield OpenAI(api_key="stub", base_url=server.base_url)
+
+
+def test_prepare_submit_wait_merge(client, tmp_path):
+    requests_path = tmp_path / "requests.jsonl"
+    articles = [("https://news.example/a", "Story A."), ("https://news.example/a", "Story A."),
+                ("https://news.example/b", "Story B.")]
+    requests = list(openai_batch.build_resume_requests([("jane.pdf", "Jane Doe\njane@doe.com")]))
+    requests += list(openai_batch.build_summary_requests(articles))
+    assert openai_batch.write_requests(requests_path, requests) == 4
+
+    batch = openai_batch.submit_batch(client, requests_path, description="test")
+    sent = [json.loads(line) for line in client.files.content(batch.input_file_id).text.splitlines()]
+    assert len({row['custom_id'] for row in sent}) == 4
+    assert not any(field in row for row in sent for field in openai_batch.LOCAL_FIELDS)
+
+    batch = openai_batch.wait_for_batch(client, batch.id, poll_interval=0.01, timeout=10)
+    assert batch.status == "completed"
+
+    resume, *summaries = openai_batch.merge_results(client, batch, requests_path)
+    assert resume == {'file': "jane.pdf", 'ok': True,
+                      'data': {'Name': "Jane Doe", 'Email': "jane@doe.com"}, 'seconds': None}
+    assert [s['url'] for s in summaries] == [url for url, _ in articles]
+    assert [s['full_text'] for s in summaries] == [text for _, text in articles]
+    assert all(s['success'] and s['summary'].startswith("summary of") for s in summaries)
+    assert all(s['metrics'] == {'ttft': None, 'generation_seconds': None} for s in summaries)
+
+
+def test_missing_results_are_reported_as_failures(client, tmp_path):
+    requests_path = tmp_path / "requests.jsonl"
+    openai_batch.write_requests(requests_path, openai_batch.build_summary_requests([("https://x/1", "Text.")]))
+    batch = openai_batch.submit_batch(client, requests_path)
+
+    # Merging before the batch finished: nothing to join yet
+    merged = openai_batch.merge_results(client, client.batches.retrieve(batch.id), requests_path)
+    assert merged == [{'url': "https://x/1", 'success': False, 'error': "no result (batch in_progress)"}]
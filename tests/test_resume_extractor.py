@@ -0,0 +1,41 @@
+import pytest
+
+import resume_extractor_st
+from resume_extractor_st import extract_contact_fields
+
+
+@pytest.mark.parametrize("text, phone", [
+    ("Call me at (555) 123-4567 anytime", "(555) 123-4567"),
+    ("Phone: +1 555 123 4567", "+1 555 123 4567"),
+    ("Mobile: +44 20 7946 0958", "+44 20 7946 0958"),
+    ("Tel 555.123.4567", "555.123.4567"),
+    ("5551234567", "5551234567"),
+])
+def test_phone_numbers_are_found(text, phone):
+    assert extract_contact_fields(text).get("Phone") == phone
+
+
+@pytest.mark.parametrize("text", [
+    "Education\nGPA 3.8\n2015 - 2019",
+    "Phone\n555\n123\n4567",
+    "IP 192.168.100.200",
+    "Order 123456789012",
+    "2015 - 2019 2020 - 2022",
+    "GPA 3.85 / 4.00 1999 2003",
+])
+def test_non_phone_numbers_are_rejected(text):
+    assert "Phone" not in extract_contact_fields(text)
+
+
+def test_email_is_found_and_name_is_left_to_the_llm():
+    fields = extract_contact_fields("Jane Doe\njane.doe@example.com.\n")
+    assert fields == {"Email": "jane.doe@example.com"}
+
+
+def test_cache_key_tracks_pipeline_and_budget(monkeypatch):
+    key = resume_extractor_st.resume_cache_key(resume_text="resume")
+    monkeypatch.setattr(resume_extractor_st, "RESUME_TOKEN_BUDGET", 1234)
+    budget_key = resume_extractor_st.resume_cache_key(resume_text="resume")
+    monkeypatch.setattr(resume_extractor_st, "PIPELINE_VERSION", "changed")
+    pipeline_key = resume_extractor_st.resume_cache_key(resume_text="resume")
+    assert len({key, budget_key, pipeline_key}) == 3
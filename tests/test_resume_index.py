@@ -0,0 +1,37 @@
+import numpy as np
+
+from resume_index import ResumeIndex
+
+
+def _vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).random((n, dim), dtype=np.float32)
+
+
+def test_repeated_key_keeps_last_vector_only():
+    index = ResumeIndex(dim=8)
+    vectors = _vectors(2)
+    index.add(["a", "a"], vectors)
+
+    assert len(index) == 1
+    assert index.search(vectors[1], k=1)[0][0] == "a"
+    assert index.search(vectors[1], k=1)[0][1] > 0.999
+    assert index.delete(["a"]) == 1
+    assert index.search(vectors[1], k=5) == []
+
+
+def test_ivf_is_retrained_as_the_corpus_grows(tmp_path):
+    index = ResumeIndex(dim=8, train_threshold=400, retrain_factor=4)
+    index.add([f"r{i}" for i in range(400)], _vectors(400))
+    assert index.is_ivf and index.trained_size == 400
+    first_nlist = index.index.nlist
+
+    index.add([f"r{i}" for i in range(400, 1600)], _vectors(1200, seed=1))
+    assert index.trained_size == 1600
+    assert index.index.nlist > first_nlist
+    assert len(index) == 1600
+
+    index.save(tmp_path)
+    loaded = ResumeIndex.load(tmp_path)
+    assert loaded.trained_size == 1600
+    query = _vectors(1, seed=1)[0]
+    assert loaded.search(query, k=1)[0][0] == "r400"
@@ -0,0 +1,13 @@
+import resume_jd_match_st as matcher
+
+
+def test_local_backend_needs_no_tokenizer(monkeypatch):
+    def no_download(name):
+        raise AssertionError(f"tokenizer {name} requested")
+
+    monkeypatch.setattr(matcher.tiktoken, "get_encoding", no_download)
+    resume = " ".join(f"python{i % 50} developer" for i in range(700))
+
+    assert len(matcher.chunk_text(resume, by="words")) == 3
+    score = matcher.compute_similarity(resume, "python1 developer", backend="local")
+    assert 0 < score <= 1
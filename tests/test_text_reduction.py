@@ -0,0 +1,25 @@
+from text_reduction import remove_repeated_lines
+
+HEADER = "Jane Doe | jane@doe.com | +1 555 123 4567"
+
+
+def test_repeated_header_kept_once():
+    pages = [
+        f"{HEADER}\nExperience\nBuilt things\nPage 1 of 2",
+        f"{HEADER}\nEducation\nStudied things\nPage 2 of 2",
+    ]
+    first, second = remove_repeated_lines(pages)
+    assert first.splitlines() == [HEADER, "Experience", "Built things"]
+    assert second.splitlines() == ["Education", "Studied things"]
+
+
+def test_bare_numbers_inside_page_are_kept():
+    pages = [
+        "Header\nSkills\nPython\n5\nTeam size\n12\nSummary\nFooter\n1",
+        "Header\nEducation\nBSc\nGPA\nHonours\nFooter\n2",
+    ]
+    first, second = remove_repeated_lines(pages)
+    assert "5" in first.splitlines()
+    assert "12" in first.splitlines()
+    assert "1" not in first.splitlines()
+    assert "2" not in second.splitlines()
@@ -0,0 +1,54 @@
+import pytest
+from openai import OpenAI
+
+import upload_registry
+from openai_stub_server import StubOpenAIServer
+from upload_registry import UploadRegistry
+
+
+@pytest.fixture
+def server():
+    with StubOpenAIServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    return OpenAI(api_key="stub", base_url=server.base_url)
+
+
+def test_same_content_is_uploaded_once(server, client, tmp_path):
+    registry = UploadRegistry(directory=tmp_path / "registry")
+    first = tmp_path / "report.pdf"
+    first.write_bytes(b"%PDF same content")
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(b"%PDF same content")
+
+    file_id = registry.upload(client, first)
+    assert registry.upload(client, copy) == file_id
+    assert registry.stats()['uploads'] == 1
+    assert registry.stats()['reused'] == 1
+    assert server.bytes_received == len(b"%PDF same content")
+
+    # Deleted remotely: the next call uploads again
+    client.files.delete(file_id)
+    assert registry.upload(client, first) != file_id
+    assert registry.stats()['uploads'] == 2
+
+
+def test_large_file_goes_through_multipart_upload(server, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_registry, "MULTIPART_THRESHOLD", 1000)
+    monkeypatch.setattr(upload_registry, "PART_SIZE", 300)
+    data = bytes(range(256)) * 10
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+
+    registry = UploadRegistry(directory=tmp_path / "registry")
+    file_id = registry.upload(client, path)
+
+    upload, = server.uploads.values()
+    assert upload['status'] == "completed"
+    assert upload['file']['id'] == file_id
+    assert client.files.content(file_id).content == data
+    assert registry.upload(client, path) == file_id
+    assert server.bytes_received == len(data)
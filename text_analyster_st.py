@@ -1,11 +1,39 @@
 import streamlit as st
 import json
-from langchain.chat_models import ChatOpenAI
+import os
+import time
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from pathlib import Path
-from dotenv import load_dotenv
-from langchain_community.chat_models import ChatOpenAI
+from llm_clients import get_chat_model
+from result_store import fingerprint, run_cached, session_result
+from text_stats import SENTENCE_RULES, DEFAULT_RULE, count_file, count_text
+
+# How the sentence-rule options read in the UI
+RULE_LABELS = {
+    'standard': "Standard (ignores abbreviations like Dr. and e.g.)",
+    'simple': "Simple (every . ! ? ends a sentence)",
+    'lines': "Lines (every line break also ends a sentence)",
+}
+
+PASTE_MODE = "✍️ Paste text"
+FILE_MODE = "📂 Large text/log file on the server"
+
+# File mode only reads files under this directory; unset disables it
+FILE_ROOT = os.getenv("TEXT_ANALYZER_ROOT", "")
+
+def resolve_server_file(file_path, root=FILE_ROOT):
+    """
+    Absolute path of file_path (relative to root, or absolute) if it is an
+    existing file inside root once symlinks and .. are resolved, else None.
+    """
+    if not root or not file_path:
+        return None
+    root = Path(root).resolve()
+    path = (root / file_path).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return str(path)
 
 def analyze_text(input_text):
     """
@@ -13,14 +41,14 @@ def analyze_text(input_text):
     This script takes text input, sends it to an LLM for analysis,
     and returns the number of characters, words, paragraphs, and sentences
     in JSON format.
+    
+    The app now counts with text_stats.count_text (exact, local); this LLM
+    path is kept as the baseline for `python text_stats.py bench --llm`.
     """
     
     # Use the provided input text
     text = input_text
     
-    # Load environment variables from .env
-    load_dotenv()
-    
     # Prompt template for counting
     PROMPT = """
     You are an expert text analyzer. Given the text below, return:
@@ -35,8 +63,8 @@ def analyze_text(input_text):
     
     prompt = PromptTemplate(input_variables=["text"], template=PROMPT)
     
-    # Initialize LLM
-    llm = ChatOpenAI(temperature=0)
+    # Shared LLM client (pooled keep-alive connections, .env loaded once)
+    llm = get_chat_model(temperature=0)
     
     # Build chain
     chain = LLMChain(llm=llm, prompt=prompt)
@@ -46,14 +74,156 @@ def analyze_text(input_text):
     
     return result
 
+def qualitative_analysis(input_text):
+    """
+    Optional LLM add-on: tone, readability and main themes of the text.
+    The counts themselves come from text_stats, not the model.
+    """
+    PROMPT = """
+    You are an expert editor. Read the text below and describe briefly:
+    1) Tone and intended audience
+    2) Readability (how easy it is to follow, and why)
+    3) Main themes or key points
+    4) One or two concrete suggestions to improve it
+    Text:
+    {text}
+    Answer in short Markdown sections. Do not count words or sentences.
+    """
+    
+    prompt = PromptTemplate(input_variables=["text"], template=PROMPT)
+    llm = get_chat_model(temperature=0)
+    chain = LLMChain(llm=llm, prompt=prompt)
+    result = chain.invoke({"text": input_text})
+    return result['text'] if isinstance(result, dict) and 'text' in result else str(result)
+
+def analyze_locally(input_text, sentence_rule, qualitative):
+    """Exact counts, plus the LLM qualitative analysis when requested."""
+    started = time.perf_counter()
+    counts = count_text(input_text, sentence_rule)
+    result = {'counts': counts, 'count_seconds': time.perf_counter() - started}
+    
+    if qualitative:
+        try:
+            with st.spinner("Running qualitative analysis... Please wait."):
+                result['qualitative'] = qualitative_analysis(input_text)
+        except Exception as e:
+            # Keep the counts even if the LLM call fails
+            result['qualitative_error'] = str(e)
+    return result
+
+def analyze_file(path, sentence_rule, workers):
+    """Exact counts for a file of any size, counted in a pool of worker processes."""
+    progress = st.progress(0.0, text="Counting...")
+    
+    def on_progress(done, total):
+        progress.progress(done / total, text=f"Counted {done / 1e6:,.0f} of {total / 1e6:,.0f} MB")
+    
+    started = time.perf_counter()
+    counts = count_file(path, sentence_rule, workers=workers, on_progress=on_progress)
+    progress.empty()
+    return {
+        'counts': counts,
+        'count_seconds': time.perf_counter() - started,
+        'file_bytes': os.path.getsize(path),
+        'workers': workers,
+    }
+
+def render_analysis(result):
+    counts = result['counts']
+    
+    st.subheader("📊 Analysis Results")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Characters", f"{counts['characters']:,}")
+    with col2:
+        st.metric("Words", f"{counts['words']:,}")
+    with col3:
+        st.metric("Paragraphs", f"{counts['paragraphs']:,}")
+    with col4:
+        st.metric("Sentences", f"{counts['sentences']:,}")
+    if 'file_bytes' in result:
+        seconds = result['count_seconds']
+        st.caption(
+            f"⚡ Counted {result['file_bytes'] / 1e6:,.1f} MB locally in {seconds:.2f} s "
+            f"({result['file_bytes'] / 1e6 / max(seconds, 1e-9):,.0f} MB/s, {result['workers']} workers)"
+        )
+    else:
+        st.caption(f"⚡ Counted locally in {result['count_seconds'] * 1000:.2f} ms")
+    
+    with st.expander("📋 Raw JSON Output"):
+        st.json(counts)
+    
+    if 'qualitative' in result:
+        st.subheader("🧠 Qualitative Analysis")
+        st.markdown(result['qualitative'])
+    elif 'qualitative_error' in result:
+        st.error(f"❌ Qualitative analysis failed: {result['qualitative_error']}")
+        st.error("Please check your OpenAI API key and internet connection.")
+
 # Streamlit App
 def main():
     st.title("📝 Text Analyzer")
-    st.write("This app analyzes text using LangChain and OpenAI Chat API to count characters, words, paragraphs, and sentences.")
+    st.write("This app counts characters, words, paragraphs, and sentences exactly, with an optional LLM qualitative analysis.")
+    
+    input_mode = st.radio("Input", [PASTE_MODE, FILE_MODE], horizontal=True)
+    
+    if input_mode == FILE_MODE:
+        # Multi-GB files can't go through the browser; they are read from the server's disk
+        st.subheader("Choose a File for Analysis")
+        if not FILE_ROOT:
+            st.info("ℹ️ Server file analysis is disabled. Set TEXT_ANALYZER_ROOT to the directory whose files may be analyzed.")
+            return
+        file_path = st.text_input(
+            f"Path to a UTF-8 text or log file under {FILE_ROOT}:",
+            placeholder="app/server.log",
+            help="Relative to the configured root; files outside it can't be opened.",
+        )
+        workers = st.number_input("Worker processes", min_value=1, max_value=64, value=os.cpu_count() or 1)
+    else:
+        # Text input
+        st.subheader("Enter Text for Analysis")
+        user_text = st.text_area("Enter your text here:", height=200, placeholder="Type or paste your text here...")
     
-    # Text input
-    st.subheader("Enter Text for Analysis")
-    user_text = st.text_area("Enter your text here:", height=200, placeholder="Type or paste your text here...")
+    # Options
+    sentence_rule = st.selectbox(
+        "Sentence boundaries",
+        list(SENTENCE_RULES),
+        index=list(SENTENCE_RULES).index(DEFAULT_RULE),
+        format_func=lambda rule: RULE_LABELS.get(rule, rule),
+    )
+    
+    if input_mode == FILE_MODE:
+        file_path = resolve_server_file(file_path.strip())
+        results_key = None
+        if file_path is not None:
+            # Size and modification time stand in for the content of a huge file
+            stat = os.stat(file_path)
+            results_key = fingerprint(file_path, stat.st_size, stat.st_mtime_ns, sentence_rule)
+        
+        if st.button("🚀 Analyze File", type="primary"):
+            if results_key is None:
+                st.error(f"❌ File not found. Please enter the path of a file under {FILE_ROOT}.")
+                return
+            
+            try:
+                _, reused = run_cached(
+                    "text_analyzer_file", results_key,
+                    lambda: analyze_file(file_path, sentence_rule, int(workers)),
+                )
+                if not reused:
+                    st.success("✅ Analysis completed!")
+            except Exception as e:
+                st.error(f"❌ An error occurred: {str(e)}")
+                return
+        
+        result = session_result("text_analyzer_file", results_key) if results_key else None
+        if result is not None:
+            render_analysis(result)
+        return
+    
+    qualitative = st.checkbox("🧠 Add qualitative analysis (uses the LLM)", value=False)
+    
+    results_key = fingerprint(user_text, sentence_rule, qualitative)
     
     # Submit button
     if st.button("🚀 Analyze Text", type="primary"):
@@ -62,59 +232,20 @@ def main():
             return
         
         try:
-            # Show loading spinner
-            with st.spinner("Analyzing text... Please wait."):
-                result = analyze_text(user_text)
-            
-            # Display results
-            st.success("✅ Analysis completed!")
-            
-            # Display the raw result
-            st.subheader("📊 Analysis Results")
-            
-            # Try to parse JSON from result if it's in the expected format
-            try:
-                if hasattr(result, 'content'):
-                    result_content = result.content
-                elif isinstance(result, dict) and 'text' in result:
-                    result_content = result['text']
-                else:
-                    result_content = str(result)
-                
-                # Try to extract JSON from the content
-                import re
-                json_match = re.search(r'\{.*\}', result_content, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                    
-                    # Display in columns
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Characters", json_data.get('characters', 'N/A'))
-                    with col2:
-                        st.metric("Words", json_data.get('words', 'N/A'))
-                    with col3:
-                        st.metric("Paragraphs", json_data.get('paragraphs', 'N/A'))
-                    with col4:
-                        st.metric("Sentences", json_data.get('sentences', 'N/A'))
-                    
-                    # Display JSON in expandable section
-                    with st.expander("📋 Raw JSON Output"):
-                        st.json(json_data)
-                else:
-                    # If no JSON found, display raw result
-                    st.write("Raw Result:")
-                    st.write(result_content)
-                    
-            except (json.JSONDecodeError, KeyError) as e:
-                st.write("Raw Result:")
-                st.write(result)
-                st.warning("Could not parse JSON from result. Displaying raw output above.")
-                
+            _, reused = run_cached(
+                "text_analyzer", results_key,
+                lambda: analyze_locally(user_text, sentence_rule, qualitative),
+                shareable=lambda result: 'qualitative_error' not in result,
+            )
+            if not reused:
+                st.success("✅ Analysis completed!")
         except Exception as e:
             st.error(f"❌ An error occurred: {str(e)}")
-            st.error("Please check your OpenAI API key and internet connection.")
+            return
+    
+    result = session_result("text_analyzer", results_key)
+    if result is not None:
+        render_analysis(result)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
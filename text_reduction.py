@@ -0,0 +1,151 @@
+import re
+from collections import Counter
+
+DEFAULT_ENCODING = "o200k_base"  # gpt-4o / gpt-4o-mini tokenizer
+TRUNCATION_MARKER = "\n[...]\n"
+
+PAGE_NUMBER_RE = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+SPACES_RE = re.compile(r"[ \t\f\v\u00a0]+")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _encoding(name):
+    # Imported on first use so header/footer cleanup alone doesn't load tiktoken
+    import tiktoken
+
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text, encoding=DEFAULT_ENCODING):
+    return len(_encoding(encoding).encode(text))
+
+
+def _line_signature(line):
+    # "Page 3 of 10" and "Page 4 of 10" should count as the same footer
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+
+def _edge_indexes(lines, edge_lines):
+    """Positions of the first/last edge_lines non-blank lines of a page."""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    return set(filled[:edge_lines] + filled[-edge_lines:])
+
+
+def remove_repeated_lines(pages, min_share=0.5, edge_lines=2):
+    """
+    Drop header/footer lines among the first/last edge_lines of a page:
+    bare page numbers, and lines whose signature recurs at the edges of
+    at least min_share of the pages (and of 2+ pages). The first
+    occurrence of a repeated line is kept, so a name/contact header
+    repeated on every page still appears once.
+    """
+    pages = [page.splitlines() for page in pages]
+    edges = [_edge_indexes(lines, edge_lines) for lines in pages]
+    if len(pages) > 1:
+        seen = Counter()
+        for lines, page_edges in zip(pages, edges):
+            seen.update({_line_signature(lines[i]) for i in page_edges})
+        threshold = max(2, int(len(pages) * min_share + 0.5))
+        repeated = {sig for sig, n in seen.items() if n >= threshold}
+    else:
+        repeated = set()
+
+    kept_once = set()
+    cleaned = []
+    for lines, page_edges in zip(pages, edges):
+        kept = []
+        for i, line in enumerate(lines):
+            if i in page_edges:
+                if PAGE_NUMBER_RE.match(line.strip()):
+                    continue
+                sig = _line_signature(line)
+                if sig in repeated:
+                    if sig in kept_once:
+                        continue
+                    kept_once.add(sig)
+            kept.append(line)
+        cleaned.append("\n".join(kept))
+    return cleaned
+
+def collapse_whitespace(text):
+    text = SPACES_RE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def truncate_to_budget(text, max_tokens, encoding=DEFAULT_ENCODING, head_share=0.8):
+    """
+    Keep the text within max_tokens. When it is too long, keep the start
+    (where contact details and recent roles usually are) and the end,
+    cutting at line boundaries, with a marker in between.
+    """
+    enc = _encoding(encoding)
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+
+    budget = max_tokens - len(enc.encode(TRUNCATION_MARKER))
+    head_tokens = int(budget * head_share)
+    head = enc.decode(tokens[:head_tokens])
+    tail = enc.decode(tokens[len(tokens) - (budget - head_tokens):]) if budget > head_tokens else ""
+
+    # Don't end/start mid-line
+    if "\n" in head:
+        head = head[:head.rfind("\n")]
+    if "\n" in tail:
+        tail = tail[tail.find("\n") + 1:]
+    return head + TRUNCATION_MARKER + tail
+
+
+def split_by_tokens(text, max_tokens, encoding=DEFAULT_ENCODING):
+    """
+    Split text into chunks of at most max_tokens, packing whole lines
+    (paragraphs, for most extracted articles) together. A line longer than
+    max_tokens on its own is cut at token boundaries.
+    """
+    enc = _encoding(encoding)
+    chunks, current, current_tokens = [], [], 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append("\n".join(current))
+        current, current_tokens = [], 0
+
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        tokens = enc.encode(line)
+        if len(tokens) > max_tokens:
+            flush()
+            chunks.extend(enc.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens))
+            continue
+        if current_tokens + len(tokens) > max_tokens:
+            flush()
+        current.append(line)
+        current_tokens += len(tokens)
+    flush()
+    return chunks
+
+
+def reduce_pages(pages, max_tokens=None, encoding=DEFAULT_ENCODING):
+    """
+    Run the full reduction stage over per-page text.
+    Returns (text, stats) where stats has tokens_before and tokens_after.
+    """
+    pages = list(pages)
+    raw = "\n".join(pages)
+    text = collapse_whitespace("\n\n".join(remove_repeated_lines(pages)))
+    if max_tokens:
+        text = truncate_to_budget(text, max_tokens, encoding)
+
+    stats = {
+        'tokens_before': count_tokens(raw, encoding),
+        'tokens_after': count_tokens(text, encoding),
+        'truncated': TRUNCATION_MARKER in text and TRUNCATION_MARKER not in raw,
+    }
+    return text, stats
+
+
+def reduce_text(text, max_tokens=None, encoding=DEFAULT_ENCODING):
+    return reduce_pages([text], max_tokens=max_tokens, encoding=encoding)
@@ -0,0 +1,464 @@
+"""
+Exact text statistics: characters, words, sentences, paragraphs, lines.
+
+    stats = count_text(text)                       # "standard" sentence rule
+    stats = count_text(text, sentence_rule="lines")
+
+Definitions:
+  - characters: Unicode code points, whitespace included
+  - words: runs of non-whitespace
+  - paragraphs: groups of words separated by at least one blank line
+  - sentences: a word ending in a terminator (". ! ?", optionally followed
+    by closing quotes/brackets) ends a sentence unless the SentenceRule
+    treats it as an abbreviation ("Dr.", "e.g.", initials). A blank line
+    always ends a sentence; the "lines" rule also ends one at every line
+    break (logs, bullet lists).
+
+Counting works on chunks: chunk_stats() summarises a piece of text and
+merge_stats() combines neighbouring pieces, so a large file can be counted
+in parallel and stitched back together (a word, sentence or paragraph may
+straddle a chunk edge). finalize() turns a summary into the counts.
+Counting is vectorised with numpy over the UTF-8 bytes; only words that
+end in "." or a closing quote are looked at one by one.
+
+count_file() does this for files too large to load: worker processes
+each memory-map the file and count one byte range (cut on a UTF-8
+character boundary), and the summaries are merged in file order.
+
+    python text_stats.py count server.log --workers 8
+    python text_stats.py scale server.log --workers 1 2 4 8
+
+Benchmark against the LLM counting path of text_analyster_st:
+    python text_stats.py bench document.txt --llm
+"""
+import argparse
+import mmap
+import multiprocessing
+import os
+import re
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from utils import peak_rss_mb
+
+TAIL = 32  # chars kept from the ends of edge words; longer than any abbreviation
+CLOSERS = "\"')]}”’»"
+OPENERS = "\"'([{“‘«"
+
+DEFAULT_ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "e.g", "i.e", "cf",
+    "approx", "dept", "est", "fig", "inc", "ltd", "co", "corp", "no", "vol", "ed",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+})
+
+# Whitespace is what str.split() splits on; "\n" alone marks line breaks
+_SPACE_CHARS = [chr(c) for c in range(0x3001) if chr(c).isspace()]
+_SPACE_LUT = np.zeros(256, dtype=bool)
+_SPACE_LUT[[ord(c) for c in _SPACE_CHARS if ord(c) < 0x80]] = True
+_MULTIBYTE_SPACE_RE = re.compile(b"|".join(re.escape(c.encode("utf-8")) for c in _SPACE_CHARS if ord(c) >= 0x80))
+NEWLINE = ord("\n")
+CHUNK_SIZE = 4 * 1024 * 1024  # bytes per worker task in count_file
+
+
+class SentenceRule:
+    """When a word ends a sentence, and whether line breaks end one too."""
+
+    def __init__(self, terminators=".!?", abbreviations=DEFAULT_ABBREVIATIONS, initials=True,
+                 break_on_newline=False):
+        self.terminators = terminators
+        self.abbreviations = frozenset(a.lower() for a in abbreviations)
+        self.initials = initials
+        self.break_on_newline = break_on_newline
+        self.enders = set(terminators + CLOSERS)
+        # Last UTF-8 byte of words that surely end a sentence ("!", "?") and of
+        # words that need a closer look (".", closing quotes)
+        sure = {c for c in terminators if c != "." and ord(c) < 0x80}
+        self.sure_bytes = np.zeros(256, dtype=bool)
+        self.sure_bytes[[ord(c) for c in sure]] = True
+        self.check_bytes = np.zeros(256, dtype=bool)
+        self.check_bytes[[c.encode("utf-8")[-1] for c in self.enders - sure]] = True
+
+    def ends_sentence(self, tail, length):
+        """tail is the last TAIL characters of a word that is length characters long."""
+        if tail[-1] not in self.enders:
+            return False
+        word = tail.rstrip(CLOSERS)
+        if not word or word[-1] not in self.terminators:
+            return False
+        if word[-1] != "." or length > TAIL:
+            return True
+        # "Dr." / "e.g." / "J." don't end a sentence; "etc..." counts as "etc"
+        core = word.rstrip(self.terminators).lstrip(OPENERS)
+        if core.lower() in self.abbreviations:
+            return False
+        if self.initials and len(core) == 1 and core.isupper():
+            return False
+        return True
+
+    def starts_sentence(self, previous_ends, newlines):
+        """Does a word start a sentence, given the previous word and the newlines in between?"""
+        return previous_ends or newlines >= 2 or (self.break_on_newline and newlines >= 1)
+
+
+SENTENCE_RULES = {
+    'standard': SentenceRule(),
+    'simple': SentenceRule(abbreviations=(), initials=False),
+    'lines': SentenceRule(break_on_newline=True),
+}
+DEFAULT_RULE = 'standard'
+
+
+def get_rule(rule):
+    return SENTENCE_RULES[rule] if isinstance(rule, str) else rule
+
+
+def _space_mask(data, codes):
+    space = _SPACE_LUT[codes]
+    if not data.isascii():
+        for match in _MULTIBYTE_SPACE_RE.finditer(data):
+            space[match.start():match.end()] = True
+    return space
+
+
+def _continuation(codes):
+    # UTF-8 continuation bytes are 0b10xxxxxx
+    return (codes & 0xC0) == 0x80
+
+
+def _char_count(codes):
+    return len(codes) - int(np.count_nonzero(_continuation(codes)))
+
+
+def _word(data, codes, start, end):
+    """(last TAIL chars, length in chars) of the word at data[start:end]."""
+    tail = data[max(start, end - 4 * TAIL - 3):end].decode("utf-8", "ignore")[-TAIL:]
+    length = len(tail) if end - start <= TAIL else _char_count(codes[start:end])
+    return tail, length
+
+
+def chunk_stats(data, rule=DEFAULT_RULE):
+    """
+    Mergeable summary of a piece of text (str, or UTF-8 bytes cut on
+    character boundaries). Decisions that depend on what lies outside the
+    piece (whether its first word starts a word, sentence or paragraph,
+    and whether its second word starts a sentence, since the first word
+    may be the end of a longer one) are left to merge_stats().
+    """
+    rule = get_rule(rule)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    codes = np.frombuffer(data, dtype=np.uint8)
+    space = _space_mask(data, codes)
+    continuation = _continuation(codes)
+    newline_at = np.flatnonzero(codes == NEWLINE)
+    stats = {
+        'characters': len(codes) - int(np.count_nonzero(continuation)),
+        'whitespace': int(np.count_nonzero(space)) - int(np.count_nonzero(space & continuation)),
+        'newlines': len(newline_at),
+        'ends_with_newline': data.endswith(b"\n"),
+        'words': 0,
+        'lead': (len(data), len(newline_at)),  # gaps are (bytes, newlines)
+        'trail': (len(data), len(newline_at)),
+        'first': None,
+        'last': None,
+        'gap12': None,
+        'paragraphs': 0,  # paragraph starts at words 2..n
+        'sentences': 0,   # sentence starts at words 3..n
+    }
+    if space.all():
+        return stats
+
+    # Word k is data[starts[k]:ends[k]]; gap k lies between words k and k + 1
+    padded = np.ones(len(space) + 2, dtype=bool)
+    padded[1:-1] = space
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    # Gap of each newline: -1 before the first word, len(starts) - 1 after the last
+    newline_gap = np.searchsorted(starts, newline_at) - 1
+    inner = newline_gap[(newline_gap >= 0) & (newline_gap < len(starts) - 1)]
+    gap_newlines = np.bincount(inner, minlength=len(starts) - 1)
+
+    last_bytes = codes[ends - 1]
+    ends_sentence = rule.sure_bytes[last_bytes]
+    check = np.flatnonzero(rule.check_bytes[last_bytes])
+    if len(check):
+        # Few distinct short words end in "." or a quote; decide each once
+        decided = {}
+        flags = []
+        for start, end in zip(starts[check].tolist(), ends[check].tolist()):
+            if end - start > TAIL:
+                flags.append(rule.ends_sentence(*_word(data, codes, start, end)))
+                continue
+            word = data[start:end]
+            flag = decided.get(word)
+            if flag is None:
+                flag = decided[word] = rule.ends_sentence(*_word(data, codes, start, end))
+            flags.append(flag)
+        ends_sentence[check] = flags
+
+    sentence_starts = ends_sentence[:-1] | (gap_newlines >= (1 if rule.break_on_newline else 2))
+    stats.update(
+        words=len(starts),
+        lead=(int(starts[0]), int(np.count_nonzero(newline_gap == -1))),
+        trail=(len(data) - int(ends[-1]), int(np.count_nonzero(newline_gap == len(starts) - 1))),
+        first=_word(data, codes, starts[0], ends[0]),
+        last=_word(data, codes, starts[-1], ends[-1]),
+        paragraphs=int(np.count_nonzero(gap_newlines >= 2)),
+        sentences=int(np.count_nonzero(sentence_starts[1:])),
+    )
+    if len(starts) >= 2:
+        stats['gap12'] = (int(starts[1] - ends[0]), int(gap_newlines[0]))
+    return stats
+
+
+def _join_words(a, b):
+    """(tail, length) of word a immediately followed by word b."""
+    return (a[0] + b[0])[-TAIL:], a[1] + b[1]
+
+
+def _add_gaps(a, b):
+    return a[0] + b[0], a[1] + b[1]
+
+
+def merge_stats(left, right, rule=DEFAULT_RULE):
+    """Summary of left's text immediately followed by right's text."""
+    rule = get_rule(rule)
+    merged = {
+        'characters': left['characters'] + right['characters'],
+        'whitespace': left['whitespace'] + right['whitespace'],
+        'newlines': left['newlines'] + right['newlines'],
+        'ends_with_newline': right['ends_with_newline'] if right['characters'] else left['ends_with_newline'],
+    }
+    if not left['words'] or not right['words']:
+        # One side is whitespace only: it just widens the other side's edge gap
+        if left['words']:
+            return {**left, **merged, 'trail': _add_gaps(left['trail'], right['lead'])}
+        return {**right, **merged, 'lead': _add_gaps(left['trail'], right['lead'])}
+
+    def second_word_starts(first_word, stats):
+        # Sentence start of the word after first_word within stats' chunk
+        if stats['words'] < 2:
+            return 0
+        return int(rule.starts_sentence(rule.ends_sentence(*first_word), stats['gap12'][1]))
+
+    merged.update(lead=left['lead'], trail=right['trail'])
+    joined = left['trail'][0] == 0 and right['lead'][0] == 0
+    if joined:
+        # The chunk edge fell inside a word
+        middle = _join_words(left['last'], right['first'])
+        merged.update(
+            words=left['words'] + right['words'] - 1,
+            first=middle if left['words'] == 1 else left['first'],
+            last=middle if right['words'] == 1 else right['last'],
+            paragraphs=left['paragraphs'] + right['paragraphs'],
+        )
+        if left['words'] == 1:
+            merged.update(gap12=right['gap12'], sentences=right['sentences'])
+        else:
+            merged.update(
+                gap12=left['gap12'],
+                sentences=left['sentences'] + second_word_starts(middle, right) + right['sentences'],
+            )
+        return merged
+
+    gap = _add_gaps(left['trail'], right['lead'])
+    merged.update(
+        words=left['words'] + right['words'],
+        first=left['first'],
+        last=right['last'],
+        paragraphs=left['paragraphs'] + right['paragraphs'] + int(gap[1] >= 2),
+    )
+    right_sentences = second_word_starts(right['first'], right) + right['sentences']
+    if left['words'] == 1:
+        merged.update(gap12=gap, sentences=right_sentences)
+    else:
+        first_right = int(rule.starts_sentence(rule.ends_sentence(*left['last']), gap[1]))
+        merged.update(gap12=left['gap12'], sentences=left['sentences'] + first_right + right_sentences)
+    return merged
+
+
+def finalize(stats, rule=DEFAULT_RULE):
+    """Counts for a summary that covers the whole text."""
+    rule = get_rule(rule)
+    words = stats['words']
+    sentences = paragraphs = 0
+    if words:
+        paragraphs = 1 + stats['paragraphs']
+        sentences = 1 + stats['sentences']
+        if words >= 2:
+            sentences += int(rule.starts_sentence(rule.ends_sentence(*stats['first']), stats['gap12'][1]))
+    characters = stats['characters']
+    return {
+        'characters': characters,
+        'characters_no_spaces': characters - stats['whitespace'],
+        'words': words,
+        'sentences': sentences,
+        'paragraphs': paragraphs,
+        'lines': stats['newlines'] + int(characters > 0 and not stats['ends_with_newline']),
+    }
+
+
+def count_text(text, sentence_rule=DEFAULT_RULE):
+    """Exact counts for text; sentence_rule is a SENTENCE_RULES name or a SentenceRule."""
+    rule = get_rule(sentence_rule)
+    return finalize(chunk_stats(text, rule), rule)
+
+
+def _char_boundary(f, position):
+    """First UTF-8 character boundary at or after position."""
+    # A character is at most 4 bytes, so the next 4 bytes hold a boundary (or the end)
+    f.seek(position)
+    for offset, byte in enumerate(f.read(4)):
+        if byte & 0xC0 != 0x80:
+            return position + offset
+    return position + 4
+
+
+def file_ranges(path, chunk_size=CHUNK_SIZE):
+    """(start, end) byte ranges of about chunk_size covering the file, cut between characters."""
+    size = os.path.getsize(path)
+    # Read the few bytes at each cut directly; mapping them would fault in whole pages
+    cuts = [0]
+    with open(path, "rb") as f:
+        for position in range(chunk_size, size, chunk_size):
+            cuts.append(max(cuts[-1], min(_char_boundary(f, position), size)))
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def _range_stats(path, start, end, rule):
+    # Each worker maps the file itself and only ever reads its own range
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return chunk_stats(mm[start:end], rule)
+
+
+def count_file(path, sentence_rule=DEFAULT_RULE, workers=None, chunk_size=CHUNK_SIZE, on_progress=None):
+    """
+    Exact counts for a UTF-8 text file of any size. Ranges are counted in
+    a pool of worker processes and merged in file order, so memory depends
+    on workers and chunk_size, not on how large the file is.
+    on_progress(bytes_done, total_bytes) is called as ranges are merged.
+    """
+    rule = get_rule(sentence_rule)
+    ranges = file_ranges(path, chunk_size)
+    total = ranges[-1][1] if ranges else 0
+    workers = min(workers or os.cpu_count() or 1, max(len(ranges), 1))
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        parts = pool.map(_range_stats, repeat(path), *zip(*ranges), repeat(rule))
+    else:
+        parts = (_range_stats(path, start, end, rule) for start, end in ranges)
+
+    stats = chunk_stats(b"", rule)
+    try:
+        for (start, end), part in zip(ranges, parts):
+            stats = merge_stats(stats, part, rule)
+            if on_progress:
+                on_progress(end, total)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return finalize(stats, rule)
+
+
+def scaling_benchmark(path, worker_counts, sentence_rule=DEFAULT_RULE, chunk_size=CHUNK_SIZE):
+    """MB/s of count_file for each worker count, with the peak RSS of any worker so far."""
+    size_mb = os.path.getsize(path) / 1e6
+    results = []
+    for workers in worker_counts:
+        started = time.perf_counter()
+        counts = count_file(path, sentence_rule, workers, chunk_size)
+        elapsed = time.perf_counter() - started
+        # With one worker the counting happens in this process
+        who = "RUSAGE_SELF" if workers == 1 else "RUSAGE_CHILDREN"
+        results.append({
+            'workers': workers,
+            'seconds': elapsed,
+            'mb_per_sec': size_mb / elapsed,
+            'peak_rss_mb': peak_rss_mb(who),
+            'counts': counts,
+        })
+    return results
+
+
+def _llm_counts(result):
+    import json
+
+    content = result['text'] if isinstance(result, dict) and 'text' in result else str(result)
+    match = re.search(r"\{.*\}", content, re.DOTALL)
+    return json.loads(match.group()) if match else None
+
+
+def benchmark(text, repeat=20, llm=False, sentence_rule=DEFAULT_RULE):
+    """Latency of the local engine (median of repeat runs) vs one LLM counting call."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        exact = count_text(text, sentence_rule)
+        timings.append(time.perf_counter() - started)
+    report = {'local_seconds': statistics.median(timings), 'exact': exact}
+
+    if llm:
+        from text_analyster_st import analyze_text
+
+        started = time.perf_counter()
+        result = analyze_text(text)
+        report['llm_seconds'] = time.perf_counter() - started
+        report['llm'] = _llm_counts(result)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact text statistics")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    count = subparsers.add_parser("count", help="Print the counts for a text file")
+    count.add_argument("file")
+    count.add_argument("--rule", choices=list(SENTENCE_RULES), default=DEFAULT_RULE)
+    count.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+
+    scale = subparsers.add_parser("scale", help="Throughput of count_file for several worker counts")
+    scale.add_argument("file")
+    scale.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    scale.add_argument("--chunk-mb", type=int, default=CHUNK_SIZE // (1024 * 1024))
+    scale.add_argument("--rule", choices=list(SENTENCE_RULES), default=DEFAULT_RULE)
+
+    bench = subparsers.add_parser("bench", help="Compare local counting latency with the LLM path")
+    bench.add_argument("file")
+    bench.add_argument("--repeat", type=int, default=20)
+    bench.add_argument("--llm", action="store_true", help="Also time one LLM call (needs OPENAI_API_KEY)")
+    bench.add_argument("--rule", choices=list(SENTENCE_RULES), default=DEFAULT_RULE)
+
+    args = parser.parse_args()
+
+    if args.command == "count":
+        for key, value in count_file(args.file, args.rule, args.workers).items():
+            print(f"{key:<22} {value}")
+        return
+
+    if args.command == "scale":
+        print(f"{'workers':>7} {'seconds':>9} {'MB/s':>8} {'peak RSS MB':>12}")
+        for r in scaling_benchmark(args.file, args.workers, args.rule, args.chunk_mb * 1024 * 1024):
+            rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else "n/a"
+            print(f"{r['workers']:>7} {r['seconds']:>9.2f} {r['mb_per_sec']:>8.1f} {rss:>12}")
+        return
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        text = f.read()
+    report = benchmark(text, args.repeat, args.llm, args.rule)
+    print(f"{'metric':<22} {'local':>10} {'llm':>10}")
+    for key, value in report['exact'].items():
+        llm_value = (report.get('llm') or {}).get(key, "-")
+        print(f"{key:<22} {value:>10} {llm_value:>10}")
+    llm_ms = f"{report['llm_seconds'] * 1000:.0f}" if 'llm_seconds' in report else "-"
+    print(f"{'latency (ms)':<22} {report['local_seconds'] * 1000:>10.2f} {llm_ms:>10}")
+
+
+if __name__ == "__main__":
+    main()
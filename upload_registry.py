@@ -0,0 +1,228 @@
+"""
+Content-addressed registry of files uploaded to the OpenAI Files API.
+
+    registry = get_upload_registry()
+    file_id = registry.upload(client, "report.pdf", purpose="user_data")
+
+A file is identified by the sha256 of its bytes (plus the API base URL
+and purpose). If the same content was uploaded before, by this or any
+other process sharing the registry directory, and that upload is still
+live, its file_id is returned and nothing is sent. Otherwise the file is
+uploaded, in parallel parts through the Uploads API when it is large,
+with expires_after set to the registry TTL so the remote copy and the
+registry entry go stale together.
+
+Stale entries (expired, or whose file was deleted remotely) are dropped
+by cleanup():
+    python upload_registry.py cleanup
+"""
+import argparse
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import diskcache
+import openai
+
+DEFAULT_REGISTRY_DIR = os.getenv("UPLOAD_REGISTRY_DIR", ".upload_registry")
+DEFAULT_TTL = int(os.getenv("UPLOAD_REGISTRY_TTL", str(7 * 24 * 60 * 60)))
+EXPIRY_MARGIN = 60 * 60  # stop handing out a file_id an hour before the API deletes the file
+
+MULTIPART_THRESHOLD = 32 * 1024 * 1024
+PART_SIZE = 16 * 1024 * 1024  # the Uploads API accepts parts of up to 64 MB
+PART_WORKERS = 4
+HASH_BLOCK = 1024 * 1024
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class UploadRegistry:
+    """
+    Disk-backed map of content hash -> uploaded file_id, with expiry.
+    Safe to share between threads and processes: the same content is only
+    ever being uploaded by one of them at a time.
+    """
+
+    def __init__(self, directory=DEFAULT_REGISTRY_DIR, ttl=DEFAULT_TTL, verify=True):
+        self.cache = diskcache.Cache(directory)
+        self.ttl = ttl
+        # Check a reused file_id still exists (a metadata GET, no upload)
+        self.verify = verify
+        self.lock = threading.Lock()
+        self.uploads = 0
+        self.reused = 0
+        self.uploaded_bytes = 0
+
+    def content_hash(self, path):
+        """sha256 of the file, re-read only when its size or mtime changes."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = f"stat:{path}"
+        cached = self.cache.get(key)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = file_sha256(path)
+        self.cache.set(key, (stat.st_size, stat.st_mtime_ns, digest), expire=self.ttl)
+        return digest
+
+    @staticmethod
+    def make_key(client, digest, purpose):
+        return f"file:{client.base_url}:{purpose}:{digest}"
+
+    def lookup(self, client, path, purpose="user_data"):
+        """Live registry entry for path's content, or None."""
+        entry = self.cache.get(self.make_key(client, self.content_hash(path), purpose))
+        if entry is None or not self.verify:
+            return entry
+        try:
+            client.files.retrieve(entry['file_id'])
+        except openai.NotFoundError:
+            # Deleted or expired remotely
+            self.cache.delete(self.make_key(client, entry['sha256'], purpose))
+            return None
+        return entry
+
+    def upload(self, client, path, purpose="user_data", mime_type=None):
+        """file_id for path's content, uploading it only if no live upload exists."""
+        digest = self.content_hash(path)
+        key = self.make_key(client, digest, purpose)
+        # Another process uploading the same content makes us wait, then reuse its file
+        with diskcache.Lock(self.cache, f"lock:{key}", expire=30 * 60):
+            entry = self.lookup(client, path, purpose)
+            if entry is not None:
+                with self.lock:
+                    self.reused += 1
+                return entry['file_id']
+
+            size = os.path.getsize(path)
+            file = self._upload(client, path, size, purpose, mime_type)
+            self.cache.set(key, {
+                'file_id': file.id,
+                'sha256': digest,
+                'bytes': size,
+                'filename': os.path.basename(path),
+                'purpose': purpose,
+                'uploaded_at': int(time.time()),
+            }, expire=max(self.ttl - EXPIRY_MARGIN, 1))
+            with self.lock:
+                self.uploads += 1
+                self.uploaded_bytes += size
+            return file.id
+
+    def _upload(self, client, path, size, purpose, mime_type):
+        expires_after = {'anchor': "created_at", 'seconds': self.ttl}
+        if size >= MULTIPART_THRESHOLD:
+            try:
+                return self._upload_parts(client, path, size, purpose, mime_type, expires_after)
+            except openai.NotFoundError:
+                pass  # no Uploads API on this endpoint; send it in one request
+        with open(path, "rb") as f:
+            return client.files.create(
+                file=(os.path.basename(path), f), purpose=purpose, expires_after=expires_after
+            )
+
+    def _upload_parts(self, client, path, size, purpose, mime_type, expires_after):
+        upload = client.uploads.create(
+            bytes=size,
+            filename=os.path.basename(path),
+            mime_type=mime_type or mimetypes.guess_type(path)[0] or "application/octet-stream",
+            purpose=purpose,
+            expires_after=expires_after,
+        )
+
+        def send_part(offset):
+            # Each thread reads only its own part, so memory is PART_WORKERS x PART_SIZE
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(PART_SIZE)
+            return client.uploads.parts.create(upload.id, data=data).id
+
+        try:
+            with ThreadPoolExecutor(max_workers=PART_WORKERS, thread_name_prefix="upload-part") as pool:
+                part_ids = list(pool.map(send_part, range(0, size, PART_SIZE)))
+            return client.uploads.complete(upload.id, part_ids=part_ids).file
+        except Exception:
+            try:
+                client.uploads.cancel(upload.id)
+            except openai.OpenAIError:
+                pass
+            raise
+
+    def cleanup(self, client=None):
+        """
+        Drop expired entries and, given a client, entries whose file no
+        longer exists on that endpoint. Returns how many were removed.
+        """
+        removed = self.cache.expire()
+        if client is None:
+            return removed
+
+        live = {f.id for f in client.files.list()}
+        prefix = f"file:{client.base_url}:"
+        for key in list(self.cache.iterkeys()):
+            if not key.startswith(prefix):
+                continue
+            entry = self.cache.get(key)
+            if entry is not None and entry['file_id'] not in live:
+                self.cache.delete(key)
+                removed += 1
+        return removed
+
+    def stats(self):
+        return {
+            'uploads': self.uploads,
+            'reused': self.reused,
+            'uploaded_bytes': self.uploaded_bytes,
+            'entries': sum(1 for key in self.cache.iterkeys() if key.startswith("file:")),
+        }
+
+    def clear(self):
+        self.cache.clear()
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def get_upload_registry():
+    """Process-wide default registry, created on first use."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = UploadRegistry()
+        return _default_registry
+
+
+def main():
+    from llm_clients import get_openai_client
+
+    parser = argparse.ArgumentParser(description="Reuse OpenAI file uploads by content hash")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upload = subparsers.add_parser("upload", help="Print a file_id for a file, uploading only if needed")
+    upload.add_argument("file")
+    upload.add_argument("--purpose", default="user_data")
+
+    subparsers.add_parser("cleanup", help="Drop expired entries and files deleted remotely")
+
+    args = parser.parse_args()
+    registry = get_upload_registry()
+    client = get_openai_client()
+
+    if args.command == "upload":
+        print(registry.upload(client, args.file, purpose=args.purpose))
+    else:
+        print(f"Removed {registry.cleanup(client)} stale entries")
+
+
+if __name__ == "__main__":
+    main()
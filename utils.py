@@ -0,0 +1,32 @@
+"""Small helpers shared by the command-line tools."""
+import json
+import os
+import sys
+
+
+def load_json_state(state_file, default=None):
+    """JSON state saved by save_json_state, or default ({}) if missing or corrupt."""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {} if default is None else default
+
+
+def save_json_state(state_file, state):
+    # Write then rename, so an interrupted save never leaves a truncated file
+    tmp_path = f"{state_file}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_file)
+
+
+def peak_rss_mb(who="RUSAGE_SELF"):
+    """Peak RSS in MB of this process (or, with "RUSAGE_CHILDREN", its largest finished child)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(getattr(resource, who)).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024